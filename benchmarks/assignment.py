@@ -0,0 +1,28 @@
+"""
+Runtime of the schema mapping solvers for square distance matrices of
+increasing size. Run with 'make benchmarks'.
+"""
+import sys, random, timeit
+from actions.match import get_best_schema_mapping
+
+
+
+def random_matrix(size, rng):
+  return [[rng.random() for _ in range(size)] for _ in range(size)]
+
+
+def benchmark(solver, sizes, repeat=3, seed=0x5eed):
+  rng = random.Random(seed)
+  print(solver, 'solver:', file=sys.stderr)
+  for size in sizes:
+    distance_matrix = random_matrix(size, rng)
+    seconds = min(timeit.repeat(
+      lambda: get_best_schema_mapping(distance_matrix, solver),
+      number=1, repeat=repeat))
+    print('{:6d} columns: {:10.4f} s'.format(size, seconds), file=sys.stderr)
+
+
+
+if __name__ == '__main__':
+  benchmark('exhaustive', (4, 8, 12))
+  benchmark('assignment', (10, 50, 200, 1000))
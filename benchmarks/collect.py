@@ -0,0 +1,56 @@
+"""
+Per-cell overhead of dispatching column items to the collectors of an
+ItemCollectorSet: dynamic filtering of the collectors for every item (the
+former implementation), the precompiled dispatch plan and batches of items.
+Run with 'make benchmarks'.
+"""
+import sys, random, string, timeit
+from operator import methodcaller, attrgetter
+from itertools import filterfalse
+from utilities.iterator import each
+from collector.base import ItemCollector
+from collector.set import ItemCollectorSet
+from collector.itemcount import ItemCountCollector
+from collector.lettercount import ItemLetterCountCollector
+from collector.letterfrequency import LetterFrequencyCollector
+
+
+
+def collect_dynamic(collector_set, items):
+  for item in items:
+    ItemCollector.collect(collector_set, item, collector_set)
+    each(methodcaller('collect', item, collector_set),
+      filterfalse(attrgetter('has_collected'), collector_set.values()))
+
+
+def collect_compiled(collector_set, items):
+  collect = collector_set.compile().collect
+  for item in items:
+    collect(item)
+
+
+def collect_batched(collector_set, items):
+  collector_set.collect_column(items, 4096)
+
+
+def benchmark(collectors, items, repeat=5):
+  print('{} collectors:'.format(len(collectors)), file=sys.stderr)
+  for collect in (collect_dynamic, collect_compiled, collect_batched):
+    seconds = min(timeit.repeat(
+      lambda: collect(ItemCollectorSet(collectors), items),
+      number=1, repeat=repeat))
+    print('{:>20}: {:8.1f} ns per cell'.format(
+        collect.__name__, seconds * 1e9 / len(items)),
+      file=sys.stderr)
+
+
+
+if __name__ == '__main__':
+  rng = random.Random(0x5eed)
+  items = [
+    ''.join(rng.choice(string.ascii_letters) for _ in range(rng.randrange(12)))
+    for _ in range(100000)]
+  benchmark((ItemCountCollector,), items)
+  benchmark(
+    (ItemCountCollector, ItemLetterCountCollector, LetterFrequencyCollector),
+    items)
@@ -1,4 +1,4 @@
-import sys, argparse, utilities.argparse, collector.description
+import sys, os.path, argparse, utilities.argparse, collector.description
 
 
 p = argparse.ArgumentParser(
@@ -61,6 +61,88 @@ p.add_argument('--time-limit', type=int, choices=range(sys.maxsize),
   "If running 'match' mode takes longer than %(metavar)s, the program is "
   "interrupted and its results up to that point written to the output "
   "destination. '0' means unrestricted time (default).")
+p.add_argument('--cascade', action='store_true', help=
+  "Collect the cheap statistics (e. g. column types) of all schema instances "
+  "first and the costly ones only for columns, that are compatible with at "
+  "least one column of another schema instance. Incompatible columns are "
+  "never matched anyway.")
+p.add_argument('--explain-plan', action='store_true', help=
+  "Print the collection phases of every schema instance to the standard "
+  "error output before they run, with the collectors of each column and an "
+  "estimated cost in item operations for each phase. Cached profiles "
+  "aren't loaded then.")
+p.add_argument('--solver', choices=('assignment', 'exhaustive'),
+  default='assignment', help=
+  "The algorithm to find the best schema mapping: 'assignment' solves the "
+  "linear assignment problem in polynomial time; 'exhaustive' tries every "
+  "mapping, which takes exponential time and is only useful to cross-check "
+  "results (default: %(default)s)")
+p.add_argument('--top-k', type=int, choices=range(1, sys.maxsize), default=1,
+  metavar='N', help=
+  "Print the %(metavar)s best schema mappings and their norms in 'match' mode "
+  "in ascending order of their norms instead of only the best one. They are "
+  "always ranked with the 'assignment' solver. (default: %(default)d)")
+p.add_argument('--bounded-norms', action='store_true', help=
+  "Compute the norms of column pairs with costly collectors (e. g. letter "
+  "distributions) only for the pairs of the best schema mapping. The others "
+  "are lower bounds from the cheaper collectors, which suffice to rule them "
+  "out. Among several equally good mappings another one may be found than "
+  "with exact norms. Ignored if norm matrices are printed ('-v').")
+p.add_argument('-j', '--jobs', type=int, choices=range(sys.maxsize),
+  default=1, metavar='N', help=
+  "Compute the norms and the best mapping of each pair of schema instances, "
+  "or in 'compare-descriptions' mode the results of each COLLECTORSET-"
+  "DESCRIPTION, in %(metavar)s parallel worker processes; '0' means one per "
+  "CPU (default: %(default)d)")
+p.add_argument('--sample', type=int, choices=range(sys.maxsize),
+  metavar='N', help=
+  "Only read a sample of each SCHEMA-INSTANCE: its head and %(metavar)s blocks "
+  "at random offsets, each starting at the next line break. Records with "
+  "quoted line breaks may be cut by the block boundaries. (default: read all "
+  "records)")
+p.add_argument('--sample-block-size', type=int, choices=range(1, sys.maxsize),
+  default=1 << 16, metavar='BYTES', help=
+  "The size of the head and of every further block in '--sample' mode "
+  "(default: %(default)d)")
+p.add_argument('--seed', type=int, default=0, help=
+  "The seed of the random block offsets in '--sample' mode; the same seed "
+  "always samples the same records of a file (default: %(default)d)")
+p.add_argument('--converge', type=float, metavar='TOLERANCE', help=
+  "Stop collecting a column once the estimates of its collectors (e. g. "
+  "averages or letter distributions) changed by at most %(metavar)s "
+  "between successive checkpoints, or once its type is 'str'. Later phases "
+  "then only use the same leading records of that column. Collectors "
+  "without estimates, e. g. minima, always read all records. (default: "
+  "off)")
+p.add_argument('--chunk-size', type=int, choices=range(1, sys.maxsize),
+  default=4096, metavar='N', help=
+  "The number of items of a column to collect at once and the interval of "
+  "the checkpoints of '--converge' (default: %(default)d)")
+p.add_argument('--no-cache', action='store_true', help=
+  "Neither load the collector results of SCHEMA-INSTANCEs from the profile "
+  "cache nor store them there. Cached results are only used for the same "
+  "file content, modification time, collector description, weights and "
+  "options affecting the results. The cached profiles are pickles, that are "
+  "loaded like trusted code: anyone who can write to the cache directory can "
+  "run code as the user of this program.")
+p.add_argument('--cache-dir', metavar='DIR', default=os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'schema-matching'),
+  help="The directory of the profile cache (default: %(default)s)")
+p.add_argument('--cache-max-size', type=int, choices=range(sys.maxsize),
+  default=256, metavar='MIB', help=
+  "Evict the least recently used profiles while the cache is larger than "
+  "%(metavar)s mebibytes (default: %(default)d)")
+p.add_argument('--cache-max-age', type=float, default=30, metavar='DAYS',
+  help=
+  "Evict profiles that haven't been used for %(metavar)s days (default: "
+  "%(default)g)")
+p.add_argument('--incremental', action='store_true', help=
+  "Treat SCHEMA-INSTANCEs as append-only: keep one cached profile per file "
+  "and update it with the records appended since, as long as the "
+  "previously collected part of the file is unchanged. Columns whose "
+  "collectors cannot be updated, e. g. when the column type changes, are "
+  "collected anew. Has no effect with '--sample' or '--converge'.")
 p.add_argument('--field-delimiter', metavar='DELIM', default=';', help=
   "The field delimiter of SCHEMA-INSTANCEs (default: '%(default)s')")
 p.add_argument('--number-format', metavar='FORMAT', default='.3e', help=
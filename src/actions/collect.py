@@ -1,49 +1,223 @@
 import sys, os.path, csv
 from functools import partial as partialfn
+from operator import methodcaller
 from utilities.iterator import map_inplace
 from utilities.functional import memberfn
 from utilities.operator import noop
+from utilities.sampling import sample_lines
+from collector.columnstore import ColumnStore
 from collector.multiphase import MultiphaseCollector
+from .profilecache import ProfileCache, source_state, read_appended
 
 
 
-def collect(src, collectorset_description, **kwargs):
+def collect(src, collectorset_description, cheap_only=False,
+    reuse_results=False, **kwargs):
   """
   Collects info about the columns of the data set in file "path" according
   over multiple phases based on a description of those phases.
 
+  If a profile cache is enabled (see 'ProfileCache.from_options') and
+  'collectorset_description' is a description module, the results for a
+  file are loaded from the cache if possible and stored in it otherwise.
+  Cheap-only collections don't load cached profiles, because the column
+  pruning after them must only consider the cheap collectors; their results
+  are stored by 'store_profile' once they are complete. Neither do
+  collections, whose plan is explained.
+
+  With the option 'incremental' the cache holds a profile per file, that is
+  updated with the records appended to the file since (see
+  'resume_schema_instance'). Sampled or converging collections cannot be
+  updated and are cached as usual.
+
+  A MultiphaseCollector is reset before collecting it again unless
+  'reuse_results' is set, e. g. for views of the results of a union of
+  descriptions (see 'MultiphaseCollector.view'); then only the collectors
+  it lacks are collected.
+
   :param src: io.IOBase | MultiphaseCollector
-  :param collectorset_description: tuple[type | ItemCollector | callable]
+  :param collectorset_description: module | tuple[type | ItemCollector | callable]
   :return: MultiphaseCollector
   """
   verbosity = kwargs.get('verbose', 0)
+  descriptions = getattr(
+    collectorset_description, 'descriptions', collectorset_description)
 
   if isinstance(src, MultiphaseCollector):
-    multiphasecollector = src.reset()
+    multiphasecollector = src if reuse_results else src.reset()
   else:
-    if verbosity >= 2:
-      src_name = getattr(src, 'name', None)
-      if src_name:
-        print(src_name, end=':\n', file=sys.stderr)
+    src_name = getattr(src, 'name', None)
+    if verbosity >= 2 and src_name:
+      print(src_name, end=':\n', file=sys.stderr)
+
+    cache = ProfileCache.from_options(**kwargs)
+    cache_key = None
+    incremental = (kwargs.pop('incremental', False) and
+      kwargs.get('sample') is None and kwargs.get('converge') is None)
+    if cache is not None and descriptions is not collectorset_description:
+      cache_key = cache.key(
+        src, collectorset_description, incremental, **kwargs)
+    # a cached profile has no phases left to explain
+    if (cache_key is not None and not cheap_only and
+      not kwargs.get('explain_plan')
+    ):
+      multiphasecollector = cache.load(
+        cache_key, os.path.basename(src_name), verbosity)
+      source = None
+      if multiphasecollector is not None and incremental:
+        source = multiphasecollector.profile_source
+        multiphasecollector = \
+          resume_schema_instance(src, multiphasecollector, **kwargs)
+        if multiphasecollector is None:
+          src.seek(0)
+      if multiphasecollector is not None:
+        getattr(src, 'close', noop)()
+        if verbosity >= 2:
+          print('(cached profile)', end='\n\n', file=sys.stderr)
+        if multiphasecollector.profile_source != source:
+          cache.store(cache_key, multiphasecollector)
+        return multiphasecollector
+
+    source = None
+    if cache_key is not None and incremental:
+      source = source_state(src_name)
     multiphasecollector = read_schema_instance(src, **kwargs)
+    multiphasecollector.profile_key = cache_key
+    multiphasecollector.profile_source = source
+
+  collect_phases(multiphasecollector, descriptions, cheap_only, **kwargs)
+  if not cheap_only:
+    store_profile(multiphasecollector, **kwargs)
+  return multiphasecollector
+
+
+def resume_schema_instance(src, multiphasecollector, field_delimiter=',',
+    verbosity=0, **kwargs):
+  """
+  Collects the records appended to a schema instance since its incremental
+  profile was stored.
+
+  :param src: io.TextIOBase
+  :param multiphasecollector: MultiphaseCollector loaded from an incremental
+    profile
+  :return: MultiphaseCollector | None None, if the collected part of the
+    schema instance changed or some collectors cannot resume (see
+    'ItemCollectorSet.resume_column'); then it must be collected anew.
+  """
+  source = multiphasecollector.profile_source
+  if source is None or not hasattr(src, 'buffer'):
+    return None
+  appended = read_appended(src.buffer, source)
+  if appended is None:
+    return None
+  appended, multiphasecollector.profile_source = appended
+
+  columns = multiphasecollector.columns
+  phase = multiphasecollector.merged_predecessors
+  appended = ColumnStore(
+    read_records(appended.decode(src.encoding).splitlines(True),
+      field_delimiter),
+    verbosity, len(phase))
+  if appended.rowcount:
+    rowcount = columns.rowcount + appended.rowcount
+    if not phase.resume_columns(appended, rowcount):
+      return None
+    columns.rowcount = rowcount
+  return multiphasecollector
+
+
+def store_profile(multiphasecollector, **kwargs):
+  """
+  Stores the results of a collector read by 'collect' in the profile cache,
+  if it wasn't loaded from it.
+
+  :param multiphasecollector: MultiphaseCollector
+  """
+  cache_key = multiphasecollector.profile_key
+  if cache_key is not None:
+    cache = ProfileCache.from_options(**kwargs)
+    if cache is not None:
+      cache.store(cache_key, multiphasecollector)
+    multiphasecollector.profile_key = None
+
 
+def collect_phases(multiphasecollector, collectorset_description, cheap_only=False, **kwargs):
+  """
+  Collects the (remaining) phases of a description without resetting the
+  collector.
+
+  :param multiphasecollector: MultiphaseCollector
+  :param collectorset_description: tuple[type | ItemCollector | callable]
+  :param cheap_only: bool
+  :return: MultiphaseCollector
+  """
+  verbosity = kwargs.get('verbose', 0)
+  number_format = kwargs.get('number_format', '')
   multiphasecollector.do_phases(collectorset_description,
-    memberfn(print_phase_results, kwargs.get('number_format', '')) if verbosity >= 2 else None)
+    memberfn(print_phase_results, number_format) if verbosity >= 2 else None,
+    cheap_only,
+    partialfn(print_phase_plan, number_format=number_format)
+      if kwargs.get('explain_plan') else None)
   if verbosity >= 2:
     print(file=sys.stderr)
 
   return multiphasecollector
 
 
-def read_schema_instance(src, field_delimiter=',', verbosity=0, **kwargs):
+def read_schema_instance(src, field_delimiter=',', verbosity=0, sample=None,
+    sample_block_size=1 << 16, seed=0, chunk_size=None, converge=None,
+    **kwargs):
+  """
+  Reads all records of a schema instance or, if 'sample' is a number, those
+  in the head of the file and in 'sample' blocks of 'sample_block_size' bytes
+  at random offsets (see 'utilities.sampling.sample_lines').
+
+  If 'converge' is a number, the collectors stop collecting a column once
+  their estimates converge within that tolerance at checkpoints every
+  'chunk_size' items (see 'collector.convergence.ColumnProgress').
+
+  :param src: io.TextIOBase
+  :return: MultiphaseCollector
+  """
   src_name = getattr(src, 'name', None)
   src_name = '<unknown schema instance>' if src_name is None else os.path.basename(src_name)
-  reader = map(partialfn(map_inplace, str.strip),
-    csv.reader(src, delimiter=field_delimiter, skipinitialspace=True))
-  result = MultiphaseCollector(reader, src_name, verbosity)
+  lines = src
+  if sample is not None:
+    if hasattr(src, 'buffer') and src.seekable():
+      lines = map(methodcaller('decode', src.encoding),
+        sample_lines(src.buffer, sample, sample_block_size, seed))
+    else:
+      print(
+        "Warning: Cannot sample the non-seekable schema instance '", src_name,
+        "'; reading all of it instead.", sep='', file=sys.stderr)
+  result = MultiphaseCollector(read_records(lines, field_delimiter), src_name, verbosity, chunk_size, converge)
   getattr(src, 'close', noop)()
   return result
 
 
+def read_records(lines, field_delimiter=','):
+  """
+  :param lines: iterable[str]
+  :return: iterable[list[str]] the records with their fields stripped
+  """
+  return map(partialfn(map_inplace, str.strip),
+    csv.reader(lines, delimiter=field_delimiter, skipinitialspace=True))
+
+
+def print_phase_plan(multiphasecollector, plan, phase_count, number_format=''):
+  if plan:
+    print(multiphasecollector.name, end=':\n', file=sys.stderr)
+    print(
+      plan.as_str(multiphasecollector.columns.rowcount,
+        multiphasecollector.merged_predecessors, number_format, phase_count),
+      end='\n\n', file=sys.stderr)
+
+
 def print_phase_results(multiphasecollector, number_format=''):
-  print(multiphasecollector.merged_predecessors.as_str(number_format), file=sys.stderr)
+  phase = multiphasecollector.merged_predecessors
+  print(phase.as_str(number_format), file=sys.stderr)
+  if multiphasecollector.tolerance is not None:
+    print('rows consumed:', ', '.join(
+        '-' if consumed is None else str(consumed)
+        for consumed in phase.consumed_rows),
+      file=sys.stderr)
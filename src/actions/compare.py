@@ -1,13 +1,26 @@
-import sys, math
-from operator import itemgetter
+import sys, io, math, contextlib
+from operator import itemgetter, attrgetter, methodcaller
+import utilities.parallel
+from utilities.iterator import each
 from utilities.functional import memberfn
 from collector.multiphase import MultiphaseCollector
-from .collect import read_schema_instance
+from collector.planner import merge_descriptions
+from .collect import read_schema_instance, collect_phases
 from .validate import validate_stats
 
 
 
 def compare_descriptions(schema_instances, collectorset_descriptions, **kwargs):
+  """
+  Ranks collector descriptions by the number of mapping errors and the mean
+  norm of the best mappings they find.
+
+  The union of all descriptions is collected once per schema instance and
+  every description is validated with a view of the results of its
+  collectors (see 'MultiphaseCollector.view'). Cascading or converging
+  collections depend on the collectors of each description, so they are
+  collected anew for every description.
+  """
   assert len(collectorset_descriptions) >= 2
   out = kwargs.get('output', sys.stdout)
 
@@ -16,13 +29,34 @@ def compare_descriptions(schema_instances, collectorset_descriptions, **kwargs):
     key=MultiphaseCollector.columncount)
   overall_stats = []
 
-  for desc in collectorset_descriptions:
-    _, _, best_matches, stats = validate_stats(
-      tuple(map(MultiphaseCollector.copy, collectors)), desc, **kwargs)
-    avg_norm = \
-      math.fsum(map(itemgetter(2), best_matches)) / len(best_matches)
-    overall_stats.append((desc, stats[1] + stats[2], avg_norm))
-    print_description_comment(desc, out)
+  shared = not kwargs.get('cascade') and kwargs.get('converge') is None
+  if shared:
+    each(memberfn(collect_phases,
+        merge_descriptions(map(attrgetter('descriptions'),
+          collectorset_descriptions)),
+        **kwargs),
+      collectors)
+
+  jobs = kwargs.get('jobs', 1)
+  if jobs == 1:
+    results = map(
+      memberfn(evaluate_description, collectors, shared, **kwargs),
+      collectorset_descriptions)
+  else:
+    # Descriptions are evaluated by forked workers, that inherit the
+    # collectors and the description modules, including those loaded by file
+    # path, and only get their index. Their outputs are printed in order.
+    results = utilities.parallel.map(evaluate_description_captured,
+      range(len(collectorset_descriptions)), jobs,
+      collectors, collectorset_descriptions, shared, dict(kwargs, jobs=1))
+
+  for desc, result in zip(collectorset_descriptions, results):
+    if jobs != 1:
+      result, output, stdout, stderr = result
+      out.write(output)
+      sys.stdout.write(stdout)
+      sys.stderr.write(stderr)
+    overall_stats.append((desc,) + result)
 
   overall_stats.sort(key=itemgetter(slice(1, 3)))
   number_format = kwargs.get('number_format', '')
@@ -43,6 +77,52 @@ def compare_descriptions(schema_instances, collectorset_descriptions, **kwargs):
   return 0
 
 
+def evaluate_description(collectorset_description, collectors, shared,
+    **kwargs):
+  """
+  Validates the best mappings, that a description finds for the given
+  collectors, and prints the results.
+
+  :param collectors: list[MultiphaseCollector] collected for the union of
+    all descriptions, if 'shared', or read, but not collected yet
+  :param shared: bool
+  :param collectorset_description: module
+  :return: (int, float) the number of mapping errors and the mean norm
+  """
+  desc = collectorset_description
+  if shared:
+    desc_collectors = tuple(map(
+      memberfn(MultiphaseCollector.view, desc.descriptions), collectors))
+  else:
+    desc_collectors = tuple(map(MultiphaseCollector.copy, collectors))
+  _, _, best_matches, stats = validate_stats(
+    desc_collectors, desc, reuse_results=shared, **kwargs)
+  avg_norm = \
+    math.fsum(map(itemgetter(2), best_matches)) / len(best_matches)
+  print_description_comment(desc, kwargs.get('output', sys.stdout))
+  return stats[1] + stats[2], avg_norm
+
+
+def evaluate_description_captured(collectors, collectorset_descriptions,
+    shared, kwargs, desc_idx):
+  """
+  Calls 'evaluate_description' for a description in a worker process and
+  captures its output.
+
+  :return: ((int, float), str, str, str) the result and the text written to
+    the output, the standard output and the standard error output
+  """
+  buffers = tuple(io.StringIO() for _ in range(3))
+  output, stdout, stderr = buffers
+  if kwargs.get('output', sys.stdout) is sys.stdout:
+    stdout = output
+  with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+    result = evaluate_description(collectorset_descriptions[desc_idx],
+      collectors, shared, **dict(kwargs, output=output))
+  return (result,) + tuple(map(methodcaller('getvalue'), buffers))
+
+
+
 def print_description_comment(desc, out):
   print(
     "... with collector descriptions and weights from {0.__file__} "
@@ -1,20 +1,29 @@
 import sys
-import collections, itertools, operator
-from itertools import repeat
-from functools import partial as partialfn
-import utilities.iterator
-from utilities import infinity
+import itertools, operator, math
+import utilities.iterator, utilities.assignment, utilities.parallel
+from utilities.assignment import SearchStatistics
 from utilities.iterator import each, map_inplace
 from utilities.functional import memberfn, composefn
 from collector.multiphase import MultiphaseCollector
+from collector.set import ItemCollectorSet
 from utilities.timelimit import Timelimit
-from .collect import collect
+from .collect import collect, collect_phases, store_profile
+
+try:
+  from collections.abc import Sequence
+except ImportError:
+  from collections import Sequence
 
 
 
 def match(schema_instances, collectorset_description, **kwargs):
   assert len(schema_instances) == 2 # TODO: raise proper error
+  top_k = kwargs.pop('top_k', 1)
   with Timelimit(kwargs.pop('time_limit', None)):
+    if top_k > 1:
+      return match_ranked(
+        schema_instances, collectorset_description, top_k, **kwargs)
+
     collectors, sort_order, best_match = \
       collect_analyse_match(schema_instances, collectorset_description, **kwargs)
     assert len(best_match) == 1
@@ -28,15 +37,154 @@ def match(schema_instances, collectorset_description, **kwargs):
     return 0
 
 
+def match_ranked(schema_instances, collectorset_description, k, **kwargs):
+  """
+  Prints the k best schema mappings and their norms in ascending order.
+  """
+  collectors, sort_order, norms_combinations = \
+    collect_analyse(schema_instances, collectorset_description, **kwargs)
+  assert len(norms_combinations) == 1
+  isreversed = not utilities.iterator.issorted(sort_order)
+  out = kwargs.get('output', sys.stdout)
+  number_format = kwargs.get('number_format', '')
+
+  ranked_mappings = itertools.islice(
+    utilities.assignment.ranked(norms_combinations[0][2]), k)
+  for rank, (norm, mapping) in enumerate(ranked_mappings, 1):
+    if rank > 1:
+      print(file=out)
+    print('{0}. norm = {1:{2}}'.format(rank, norm, number_format), file=out)
+    print_match_result(mapping, isreversed, **kwargs)
+  return 0
+
+
 def collect_analyse_match(collectors, collectorset_description, **kwargs):
   """
   :param collectors: list[io.IOBase | MultiphaseCollector]
   :param collectorset_description: object
   :return: list[MultiphaseCollector], list[int], list[int, int, float, list[int]]
   """
-  assert isinstance(collectors, collections.Sequence) and len(collectors) >= 2
+  collectors, sort_order = \
+    collect_sorted(collectors, collectorset_description, **kwargs)
+  MultiphaseCollector.index_distributions(collectors)
+
+  # analyse collected data and find minimal combinations; printed norm
+  # matrices are always exact
+  norms_combinations = utilities.parallel.map(analyse_match_combination,
+    itertools.combinations(range(len(collectors)), 2), kwargs.get('jobs', 1),
+    collectors, collectorset_description.weights,
+    kwargs.get('solver', 'assignment'),
+    kwargs.get('bounded_norms', False) and kwargs.get('verbose', 0) < 1)
+
+  print_norms_combinations(collectors, norms_combinations, **kwargs)
+  for c1_idx, c2_idx, _, _, statistics in norms_combinations:
+    print_search_statistics(statistics, collectors[c2_idx], collectors[c1_idx],
+      **kwargs)
+
+  return collectors, sort_order, [
+    [c1_idx, c2_idx, best_match_norm, best_match]
+    for c1_idx, c2_idx, _, (best_match_norm, best_match), _
+    in norms_combinations]
+
+
+def analyse_match_combination(collectors, weights, solver, bounded,
+    combination):
+  """
+  Computes the norms of all column pairs of two collectors and their best
+  schema mapping.
+
+  :param collectors: list[MultiphaseCollector]
+  :param weights: WeightDict
+  :param solver: str
+  :param bounded: bool whether the norms of pairs, that aren't part of the
+    best mapping, may be lower bounds (see 'bounded_results_norms')
+  :param combination: (int, int)
+  :return: (int, int, list[list[float]], (float, tuple[int]), SearchStatistics)
+  """
+  c1_idx, c2_idx = combination
+  norms = (bounded_results_norms if bounded else MultiphaseCollector.results_norms)(
+    collectors[c1_idx], collectors[c2_idx], weights)
+  statistics = SearchStatistics()
+  best_match = get_best_schema_mapping(norms, solver, statistics)
+  return c1_idx, c2_idx, norms, best_match, statistics
+
+
+def bounded_results_norms(a, b, weights, max_norm_cost=1):
+  """
+  Returns the norms of all column pairs of two collectors like
+  'MultiphaseCollector.results_norms', except that the norms of pairs, that
+  aren't part of the best schema mapping, may be lower bounds, so their
+  costliest collectors are skipped.
+
+  The lower bounds of all norms from the collector types up to
+  'max_norm_cost' are refined to exact norms only for the pairs of the best
+  mapping of the current matrix, until that mapping consists of exact norms
+  alone. As no norm of the matrix exceeds the exact one, no other mapping
+  can be better, though it may differ from the one of the exact norms, if
+  several mappings have the best norm. The norms are computed exactly if any
+  bound is not finite.
+
+  :param a: MultiphaseCollector
+  :param b: MultiphaseCollector
+  :param weights: WeightDict
+  :param max_norm_cost: float
+  :return: list[list[float]]
+  """
+  norms = MultiphaseCollector.results_norms(a, b, weights, None, max_norm_cost)
+  if not all(map(math.isfinite, itertools.chain.from_iterable(norms))):
+    return MultiphaseCollector.results_norms(a, b, weights)
+
+  a_sets = a.merged_predecessors
+  b_sets = b.merged_predecessors
+  exact = set()
+  while True:
+    _, mapping = utilities.assignment.solve(norms)
+    if mapping is None:
+      return norms
+    pairs = [
+      (a_idx, b_idx) for a_idx, b_idx in enumerate(mapping)
+      if (a_idx, b_idx) not in exact]
+    if not pairs:
+      return norms
+    for a_idx, b_idx in pairs:
+      norm = ItemCollectorSet.result_norm(
+        a_sets[a_idx].get_result(), b_sets[b_idx].get_result(), weights)
+      if not math.isfinite(norm):
+        return MultiphaseCollector.results_norms(a, b, weights)
+      norms[b_idx][a_idx] = norm
+      exact.add((a_idx, b_idx))
+
+
+def collect_analyse(collectors, collectorset_description, **kwargs):
+  """
+  :param collectors: list[io.IOBase | MultiphaseCollector]
+  :param collectorset_description: object
+  :return: list[MultiphaseCollector], list[int], list[int, int, list[list[float]], None]
+  """
+  collectors, sort_order = \
+    collect_sorted(collectors, collectorset_description, **kwargs)
+  MultiphaseCollector.index_distributions(collectors)
+
+  norms_combinations = [
+    [c1_idx, c2_idx,
+      MultiphaseCollector.results_norms(collectors[c1_idx], collectors[c2_idx],
+        collectorset_description.weights), None]
+    for c1_idx, c2_idx in itertools.combinations(range(len(collectors)), 2)]
+
+  print_norms_combinations(collectors, norms_combinations, **kwargs)
+  return collectors, sort_order, norms_combinations
+
+
+def collect_sorted(collectors, collectorset_description, **kwargs):
+  """
+  :param collectors: list[io.IOBase | MultiphaseCollector]
+  :param collectorset_description: object
+  :return: list[MultiphaseCollector], list[int]
+  """
+  assert isinstance(collectors, Sequence) and len(collectors) >= 2
+  cascade = kwargs.get('cascade', False)
   collect_functor = \
-    memberfn(collect, collectorset_description.descriptions, **kwargs)
+    memberfn(collect, collectorset_description, cheap_only=cascade, **kwargs)
 
   if isinstance(collectors[0], MultiphaseCollector):
     assert all(map(memberfn(isinstance, MultiphaseCollector), collectors))
@@ -49,72 +197,54 @@ def collect_analyse_match(collectors, collectorset_description, **kwargs):
       utilities.iterator.sorted_with_order(
         map(collect_functor, collectors), MultiphaseCollector.columncount)
 
-  # analyse collected data
-  norms_combinations = [
-    [c1_idx, c2_idx,
-      MultiphaseCollector.results_norms(collectors[c1_idx], collectors[c2_idx],
-        collectorset_description.weights), None]
-    for c1_idx, c2_idx in itertools.combinations(range(len(collectors)), 2)]
+  if cascade:
+    # collect the costly phases only for columns with compatible counterparts
+    pruned_columns = MultiphaseCollector.prune_incompatible_columns(collectors)
+    if kwargs.get('verbose', 0) >= 2:
+      for collector, pruned in zip(collectors, pruned_columns):
+        print(collector.name, 'pruned columns:',
+          ', '.join(map(str, map((1).__add__, pruned))) or '-', file=sys.stderr)
+    each(
+      memberfn(collect_phases, collectorset_description.descriptions, **kwargs),
+      collectors)
+    each(memberfn(store_profile, **kwargs), collectors)
+
+  return collectors, sort_order
+
 
+def print_norms_combinations(collectors, norms_combinations, **kwargs):
   if kwargs.get('verbose', 0) >= 1:
     formatter = memberfn(format, kwargs.get('number_format', ''))
-    for c1_idx, c2_idx, norms, _ in norms_combinations:
+    for norms_combination in norms_combinations:
+      c1_idx, c2_idx, norms = norms_combination[:3]
       print(collectors[c2_idx].name, collectors[c1_idx].name,
         sep=' / ', end='\n| ', file=sys.stderr)
       print(*('  '.join(map(formatter, row)) for row in norms),
         sep=' |\n| ', end=' |\n\n', file=sys.stderr)
 
-  # find minimal combinations
-  for norms_combination in norms_combinations: # TODO: rewrite as functional clause
-    norms_combination[2:4] = get_best_schema_mapping(norms_combination[2])
 
-  return collectors, sort_order, norms_combinations
-
-
-def get_best_schema_mapping(distance_matrix):
+def get_best_schema_mapping(distance_matrix, solver='assignment', statistics=None):
   """
   :param distance_matrix: list[list[float]]
+  :param solver: str
+  :param statistics: utilities.assignment.SearchStatistics
   :return: (float, tuple[int])
   """
   assert operator.eq(*utilities.minmax(map(len, distance_matrix)))
-  successor = (1).__add__
-  predecessor = (1).__rsub__
-
-  maxI = len(distance_matrix) # row count
-  maxJ = len(distance_matrix[0]) # column count
-  assert maxI >= maxJ
-  rangeJ = range(maxJ)
-  known_mappings = list(repeat(None, maxJ))
-
-  iter_unmapped = partialfn(filter,
-    composefn(known_mappings.__getitem__, partialfn(operator.is_, None)),
-    rangeJ)
-
-  def sweep_row(i, skippable_count):
-    if Timelimit.interrupted_flag or skippable_count < 0:
-      return infinity, None
-    if i == maxI:
-      return 0, tuple(known_mappings)
-
-    # try to skip column j
-    minlength, minpath = sweep_row(successor(i), predecessor(skippable_count))
-
-    for j in iter_unmapped():
-      if Timelimit.interrupted_flag:
-        break
-      d = distance_matrix[i][j]
-      if d is not None:
-        known_mappings[j] = i
-        length, path = sweep_row(successor(i), skippable_count)
-        known_mappings[j] = None
-        length += d
-        if length < minlength:
-          assert path is not None
-          minlength = length
-          minpath = path
-    return minlength, minpath
-
-  return sweep_row(0, maxI - maxJ)
+  return schema_mapping_solvers[solver](distance_matrix, statistics)
+
+
+schema_mapping_solvers = {
+  'assignment': utilities.assignment.solve,
+  'exhaustive': utilities.assignment.branch_and_bound
+}
+
+
+def print_search_statistics(statistics, collector1, collector2, **kwargs):
+  verbosity = kwargs.get('verbose', 0)
+  if verbosity >= 2 or (verbosity >= 1 and statistics.interrupted):
+    print(collector1.name, collector2.name, sep=' / ', end=': ', file=sys.stderr)
+    print(statistics.as_str(kwargs.get('number_format', '')), file=sys.stderr)
 
 
 def print_match_result(column_mappings, reversed=False, **kwargs):
@@ -0,0 +1,342 @@
+import sys, os, os.path, io, time, types, numbers, pickle, hashlib, tempfile, \
+  importlib
+from collector.columnstore import ColumnStore
+from collector.multiphase import MultiphaseCollector
+from collector.rows import RowCollector
+
+
+
+class ProfileCache(object):
+  """
+  Stores the collector results of schema instances in a directory, so later
+  runs with the same file and the same options can skip reading and
+  collecting it.
+
+  A profile is keyed by the size, modification time and content hash of
+  the schema instance file, by the identity of the collector description
+  module including its weights, by the source code of the collectors (see
+  'code_fingerprint'), and by all options, that change the collected
+  records or results. Incremental profiles of append-only schema instances
+  are keyed by the file path instead and store the size and hash of the
+  collected part of the file (see 'read_appended'). Profiles are evicted
+  when they haven't been used for 'max_age' seconds, or, least recently used
+  first, while the cache is larger than 'max_size' bytes.
+  """
+
+  # the format of stored profiles
+  version = 4
+
+  suffix = '.profile'
+
+  # options of 'actions.collect.read_schema_instance' that change results
+  option_names = (
+    'field_delimiter', 'sample', 'sample_block_size', 'seed', 'converge')
+
+
+  def __init__(self, directory, max_size=256 << 20, max_age=30 * 86400,
+      verbosity=0):
+    super().__init__()
+    self.directory = directory
+    self.max_size = max_size
+    self.max_age = max_age
+    self.verbosity = verbosity
+
+
+  @staticmethod
+  def from_options(no_cache=False, cache_dir=None, cache_max_size=256,
+      cache_max_age=30, verbose=0, **kwargs):
+    """
+    Returns the profile cache of the command-line options, which is enabled
+    unless 'no_cache' is set, like with the '--no-cache' option, or there is
+    no 'cache_dir'.
+
+    :param cache_max_size: int in MiB
+    :param cache_max_age: float in days
+    :return: ProfileCache | None
+    """
+    if no_cache or not cache_dir:
+      return None
+    return ProfileCache(
+      cache_dir, cache_max_size << 20, cache_max_age * 86400, verbose)
+
+
+  def key(self, src, collectorset_description, incremental=False, **kwargs):
+    """
+    :param src: io.IOBase
+    :param collectorset_description: module
+    :param incremental: bool whether to key an incremental profile
+    :return: str | None the key of the profile, or None if 'src' isn't a
+      regular file
+    """
+    path = getattr(src, 'name', None)
+    if not isinstance(path, str) or not os.path.isfile(path):
+      return None
+
+    h = hashlib.sha256()
+    h.update(repr((
+        self.version, code_fingerprint(),
+        ('incremental', os.path.realpath(path)) if incremental else
+          file_fingerprint(path),
+        description_fingerprint(collectorset_description),
+        tuple(kwargs.get(name) for name in self.option_names),
+        # the chunk size only changes results through the checkpoints of
+        # converging columns
+        kwargs.get('chunk_size') if kwargs.get('converge') is not None else None
+      )).encode())
+    return h.hexdigest()
+
+
+  def path(self, key):
+    return os.path.join(self.directory, key + self.suffix)
+
+
+  def load(self, key, name=None, verbosity=0):
+    """
+    :param key: str
+    :return: MultiphaseCollector | None
+    """
+    path = self.path(key)
+    try:
+      with open(path, 'rb') as f:
+        profile = pickle.load(f)
+    except FileNotFoundError:
+      return None
+    except Exception as ex:
+      self.__warn('Cannot load cached profile', path, ex)
+      return None
+
+    os.utime(path)
+    columns = ColumnStore()
+    columns.rowcount = profile['rowcount']
+    collector = MultiphaseCollector(columns, name, verbosity)
+    collector.merged_predecessors = RowCollector(profile['columns'], verbosity)
+    collector.merged_predecessors.consumed_rows = profile['consumed_rows']
+    collector.profile_source = profile['source']
+    return collector
+
+
+  def store(self, key, collector):
+    """
+    Stores the results of a fully collected MultiphaseCollector unless some
+    of its columns were pruned, because they depend on the other schema
+    instances.
+
+    :param key: str
+    :param collector: MultiphaseCollector
+    """
+    phase = collector.merged_predecessors
+    if any(column.ispruned() for column in phase):
+      return
+    profile = {
+      'rowcount': collector.columns.rowcount,
+      'columns': list(phase),
+      'consumed_rows': phase.consumed_rows,
+      'source': collector.profile_source,
+    }
+
+    try:
+      os.makedirs(self.directory, exist_ok=True)
+      fd, tmp_path = tempfile.mkstemp(self.suffix + '.tmp', '', self.directory)
+      try:
+        with io.open(fd, 'wb') as f:
+          pickle.dump(profile, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path(key))
+      except:
+        os.unlink(tmp_path)
+        raise
+    except (OSError, pickle.PicklingError, AttributeError, TypeError) as ex:
+      self.__warn('Cannot store profile of', collector.name, ex)
+      return
+
+    self.evict()
+
+
+  def evict(self):
+    """Removes expired profiles and the least recently used ones beyond the
+    size limit."""
+    try:
+      entries = []
+      with os.scandir(self.directory) as it:
+        for entry in it:
+          if entry.name.endswith(self.suffix) and entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError as ex:
+      self.__warn('Cannot list profile cache', self.directory, ex)
+      return
+
+    entries.sort(reverse=True)
+    expiry = time.time() - self.max_age
+    total_size = 0
+    for mtime, size, path in entries:
+      total_size += size
+      if mtime < expiry or total_size > self.max_size:
+        try:
+          os.unlink(path)
+        except OSError:
+          pass
+
+
+  def __warn(self, message, subject, ex):
+    if self.verbosity >= 1:
+      print('Warning:', message, "'{}':".format(subject), ex, file=sys.stderr)
+
+
+
+def file_fingerprint(path, block_size=1 << 20):
+  """
+  :param path: str
+  :return: (int, int, str) size, modification time in nanoseconds and
+    SHA-256 digest of the file
+  """
+  h = hashlib.sha256()
+  with open(path, 'rb') as f:
+    stat = os.fstat(f.fileno())
+    for block in iter(lambda: f.read(block_size), b''):
+      h.update(block)
+  return stat.st_size, stat.st_mtime_ns, h.hexdigest()
+
+
+def source_state(path, block_size=1 << 20):
+  """
+  :param path: str
+  :return: (int, str) | None the size and SHA-256 digest of the file, or
+    None unless it ends with a complete line, because then an appended
+    record could continue its last one
+  """
+  h = hashlib.sha256()
+  size = 0
+  block = b''
+  with open(path, 'rb') as f:
+    for block in iter(lambda: f.read(block_size), b''):
+      h.update(block)
+      size += len(block)
+  if size and not block.endswith(b'\n'):
+    return None
+  return size, h.hexdigest()
+
+
+def read_appended(src_binary, source, block_size=1 << 20):
+  """
+  Reads the data appended to a file since it had the state 'source'.
+
+  :param src_binary: io.BufferedIOBase positioned at the start of the file
+  :param source: (int, str) as returned by 'source_state'
+  :return: (bytes, (int, str) | None) | None the appended data and the
+    state of the whole file, or None if the first 'source[0]' bytes of the
+    file changed
+  """
+  size, digest = source
+  h = hashlib.sha256()
+  remaining = size
+  while remaining:
+    block = src_binary.read(min(remaining, block_size))
+    if not block:
+      return None
+    h.update(block)
+    remaining -= len(block)
+  if h.hexdigest() != digest:
+    return None
+
+  appended = src_binary.read()
+  h.update(appended)
+  new_size = size + len(appended)
+  if new_size and not (appended or b'\n').endswith(b'\n'):
+    return appended, None
+  return appended, (new_size, h.hexdigest())
+
+
+# the packages, whose code collects and represents profiles
+fingerprinted_packages = ('collector', 'utilities')
+
+_code_fingerprint = None
+
+
+def code_fingerprint():
+  """
+  Identifies the code of the collectors and of the data structures of their
+  results by the SHA-256 digest of the source files of
+  'fingerprinted_packages', so profiles stored by any other version of it
+  aren't loaded.
+
+  :return: str
+  """
+  global _code_fingerprint
+  if _code_fingerprint is None:
+    h = hashlib.sha256()
+    for package_name in fingerprinted_packages:
+      for package_dir in importlib.import_module(package_name).__path__:
+        for dirpath, dirnames, filenames in os.walk(package_dir):
+          dirnames[:] = sorted(
+            dirname for dirname in dirnames if dirname != '__pycache__')
+          for filename in sorted(filenames):
+            if filename.endswith('.py'):
+              path = os.path.join(dirpath, filename)
+              h.update(os.path.relpath(path, package_dir).encode())
+              with open(path, 'rb') as f:
+                h.update(hashlib.sha256(f.read()).digest())
+    _code_fingerprint = h.hexdigest()
+  return _code_fingerprint
+
+
+def description_fingerprint(collectorset_description):
+  """
+  Identifies a collector description module by its name, the content of its
+  source file, if any, and its collector descriptions and weights.
+
+  :param collectorset_description: module
+  :return: tuple
+  """
+  desc = collectorset_description
+  source_file = getattr(desc, '__file__', None)
+  source = None
+  if isinstance(source_file, str) and os.path.isfile(source_file):
+    with open(source_file, 'rb') as f:
+      source = hashlib.sha256(f.read()).hexdigest()
+  return (
+    getattr(desc, '__name__', None), source,
+    _fingerprint(getattr(desc, 'descriptions', desc)),
+    weights_fingerprint(getattr(desc, 'weights', None)))
+
+
+def weights_fingerprint(weights):
+  """
+  :param weights: WeightDict | None
+  :return: tuple
+  """
+  if weights is None:
+    return None
+  return (
+    _weight_fingerprint(weights.default),
+    _fingerprint(weights.sum_data),
+    tuple(sorted(map(str, weights.tags))),
+    tuple(sorted(
+      (_fingerprint(ctype), _weight_fingerprint(weight))
+      for ctype, weight in weights.items())))
+
+
+def _weight_fingerprint(weight):
+  if getattr(weight.weightfn, '__self__', None) is weight.coefficient:
+    return weight.coefficient
+  return _fingerprint(weight.weightfn)
+
+
+def _fingerprint(obj):
+  """
+  Returns a representation of collector templates, functions and simple
+  values, that is equal across program runs.
+  """
+  if obj is None or isinstance(obj, (bool, numbers.Number, str)):
+    return obj
+  if isinstance(obj, types.ModuleType):
+    return obj.__name__
+  if isinstance(obj, type) or (callable(obj) and hasattr(obj, '__qualname__')):
+    return obj.__module__ + '.' + obj.__qualname__
+  if isinstance(obj, (tuple, list)):
+    return tuple(map(_fingerprint, obj))
+  if isinstance(obj, (set, frozenset)):
+    return tuple(sorted(map(_fingerprint, obj), key=repr))
+  if hasattr(obj, '__dict__'):
+    return (_fingerprint(type(obj)), tuple(sorted(
+      (name, _fingerprint(value)) for name, value in vars(obj).items())))
+  return repr(obj)
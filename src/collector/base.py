@@ -20,6 +20,13 @@ class ItemCollector(object):
 
   result_dependencies = ()
 
+  # the estimated cost of collecting a single item relative to other collectors
+  collect_cost = 1
+
+  # the estimated cost of the norm of two results relative to other
+  # collectors
+  norm_cost = 1
+
 
   @staticmethod
   def get_instance(template, *args):
@@ -44,11 +51,56 @@ class ItemCollector(object):
     pass
 
 
+  def collect_batch(self, items, collector_set):
+    """Called with a sequence of consecutive items of a column instead of
+    'collect' for each of them.
+
+    Override this in subclasses that can process many items at once faster.
+    """
+    collect = self.collect
+    for item in items:
+      collect(item, collector_set)
+
+
   def get_result(self, collector_set):
     """Returns the result of this collector after all items have been collected."""
     return NotImplemented
 
 
+  def get_estimate(self, count):
+    """Returns an estimate of the result after 'count' items have been
+    collected, that is comparable to later estimates, or NotImplemented if
+    the result cannot be estimated before all items have been collected.
+
+    Override this in subclasses whose results converge with more items.
+    """
+    return NotImplemented
+
+
+  def has_final_result(self):
+    """Returns whether more items cannot change the result anymore."""
+    return False
+
+
+  def resume(self, collector_set, rowcount):
+    """Prepares this collector, after it collected all items of a column, to
+    collect further items appended to that column, e. g. the new records of
+    an append-only schema instance, until 'set_collected' is called again.
+
+    Returns whether the results after the appended items equal those of
+    collecting the whole column anew. Collectors, that collect no items
+    themselves, can always resume; those that do must override this, if
+    they accumulate their results in a single pass.
+
+    :param collector_set: ItemCollectorSet
+    :param rowcount: int the number of items of the column including the
+      appended ones
+    :return: bool
+    """
+    self.__has_collected = False
+    return type(self).collect is ItemCollector.collect
+
+
   @property
   def has_collected(self): return self.__has_collected
   def set_collected(self): self.__has_collected = True
@@ -0,0 +1,174 @@
+import itertools
+from utilities.numeric import TypedColumn
+
+try:
+  from collections.abc import Sequence, MutableSequence
+except ImportError:
+  from collections import Sequence, MutableSequence
+
+
+
+class ColumnStore(list):
+  """
+  Stores a set of rows column-major as one list per column.
+
+  The column count is 'column_count' or else that of the first row. Surplus
+  items of longer rows are dropped and shorter rows are padded with empty
+  strings, like the empty fields of delimited files.
+
+  Copies share their columns until they replace or change them, so the
+  parsed items of a schema instance are stored only once, however many
+  copies transform their columns differently.
+  """
+
+  def __init__(self, rows=(), verbosity=0, column_count=None):
+    list.__init__(self)
+    self.rowcount = 0
+    # the indices of the columns shared with copies of this store
+    self.__shared = set()
+    rows = iter(rows)
+    first_row = next(rows, None)
+    if first_row is None:
+      return
+
+    if column_count is None:
+      column_count = len(first_row)
+    columns = tuple([] for _ in range(column_count))
+    self.extend(columns)
+    appenders = tuple(column.append for column in columns)
+    for items in itertools.chain((first_row,), rows):
+      self.rowcount += 1
+      if len(items) != column_count:
+        if verbosity >= 2:
+          import sys
+          print(
+            'Row {} has {} columns, expected {}: {}'.format(
+              self.rowcount, len(items), column_count, items),
+            file=sys.stderr)
+        items = list(items[:column_count])
+        items += [''] * (column_count - len(items))
+      for append, item in zip(appenders, items):
+        append(item)
+
+
+  def columncount(self):
+    return len(self)
+
+
+  @property
+  def rows(self):
+    """A row-wise view of the stored columns"""
+    return RowView(self)
+
+
+  def transform(self, column_idx, transformer):
+    """
+    Replaces the items of a column with the transformed ones. The results of
+    transformers with a 'typecode' attribute, that are numbers of that
+    'array.array' type or None, are stored in a TypedColumn if they fit.
+    Columns of str items stay as they are under the str transformer.
+
+    :param column_idx: int
+    :param transformer: callable
+    """
+    items = self[column_idx]
+    if transformer is str and set(map(type, items)) <= {str}:
+      return
+    items = list(map(transformer, items))
+    typecode = getattr(transformer, 'typecode', None)
+    if typecode is not None:
+      items = TypedColumn.from_items(typecode, items) or items
+    self[column_idx] = items
+    self.__shared.discard(column_idx)
+
+
+  def set_item(self, column_idx, row_idx, item):
+    """Changes a single item; shared columns are copied first."""
+    if column_idx < 0:
+      column_idx += len(self)
+    column = self[column_idx]
+    if column_idx in self.__shared or not isinstance(column, list):
+      column = self[column_idx] = list(column)
+      self.__shared.discard(column_idx)
+    column[row_idx] = item
+
+
+  def copy(self):
+    """
+    :return: ColumnStore a copy, that shares all columns with this store
+    """
+    result = ColumnStore()
+    result.extend(self)
+    result.rowcount = self.rowcount
+    self.__shared.update(range(len(self)))
+    result.__shared.update(range(len(self)))
+    return result
+
+
+
+class RowView(Sequence):
+  """Adapts a ColumnStore to the sequence of rows interface"""
+
+  def __init__(self, columns):
+    super().__init__()
+    self.columns = columns
+
+
+  def __len__(self):
+    return self.columns.rowcount
+
+
+  def __getitem__(self, row_idx):
+    if isinstance(row_idx, slice):
+      return tuple(map(self.__getitem__, range(*row_idx.indices(len(self)))))
+    if row_idx < 0:
+      row_idx += len(self)
+    if not 0 <= row_idx < len(self):
+      raise IndexError(row_idx)
+    return Row(self.columns, row_idx)
+
+
+
+class Row(MutableSequence):
+  """A single row of a ColumnStore; item assignments change the store."""
+
+  def __init__(self, columns, row_idx):
+    super().__init__()
+    self.columns = columns
+    self.row_idx = row_idx
+
+
+  def __len__(self):
+    return len(self.columns)
+
+
+  def __getitem__(self, column_idx):
+    if isinstance(column_idx, slice):
+      return [column[self.row_idx] for column in self.columns[column_idx]]
+    return self.columns[column_idx][self.row_idx]
+
+
+  def __setitem__(self, column_idx, item):
+    if isinstance(column_idx, slice):
+      raise TypeError('Cannot assign slices of a row')
+    self.columns.set_item(column_idx, self.row_idx, item)
+
+
+  def __delitem__(self, column_idx):
+    raise TypeError('Cannot delete items of a row')
+
+
+  def insert(self, column_idx, item):
+    raise TypeError('Cannot insert items into a row')
+
+
+  def __eq__(self, other):
+    return isinstance(other, Sequence) and list(self) == list(other)
+
+
+  def __ne__(self, other):
+    return not self.__eq__(other)
+
+
+  def __repr__(self):
+    return repr(list(self))
@@ -7,6 +7,7 @@ from utilities import infinity
 from utilities.iterator import countif
 from . import ItemCollector
 from .itemcount import ItemCountCollector
+from .planner import collector_name
 
 
 __decimal_regex = re.compile(r"\s*([-+]?)(|\d[^,.]*?|[^,.]*\d|.*?([,.]).*?)\s*$")
@@ -36,10 +37,35 @@ def decimal_info(item):
   return decimal_separator, total_len, invalid_char_count
 
 
+# Plain decimal numbers of ASCII digits, whose 'decimal_info' needs no regex
+# back-tracking
+_plain_decimal_regex = re.compile(r"[-+]?(?:[0-9]+[,.]?[0-9]*|[,.][0-9]+)$")
+_decimal_info_cache = dict()
+_decimal_info_cache_size = 1 << 16
+
+def cached_decimal_info(item):
+  """Returns the same as 'decimal_info', but looks up recurring items in a
+  bounded cache and recognises plain decimal numbers without 'decimal_info'."""
+  info = _decimal_info_cache.get(item, _decimal_info_cache)
+  if info is _decimal_info_cache:
+    if _plain_decimal_regex.match(item):
+      info = (
+        ',' if ',' in item else '.' if '.' in item else '', len(item), 0)
+    else:
+      info = decimal_info(item)
+    if len(_decimal_info_cache) >= _decimal_info_cache_size:
+      _decimal_info_cache.clear()
+    _decimal_info_cache[item] = info
+  return info
+
+
 def tofloat(item):
-  item = item.replace(',', '.', 1)
   try:
     return float(item)
+  except ValueError:
+    pass
+  try:
+    return float(item.replace(',', '.', 1))
   except ValueError:
     return None
 
@@ -51,12 +77,18 @@ def toint(item):
     return None
 
 
+# the 'array.array' type codes to store the results of transformers in (see
+# 'ColumnStore.transform')
+toint.typecode = 'q'
+tofloat.typecode = 'd'
+
+
 
 def _make_type_distance_matrix(type_sequence):
   return [
     [
         float(a is not b)
-      if isinstance(a, Number) is isinstance(b, Number) else
+      if issubclass(a, Number) is issubclass(b, Number) else
         infinity
       for a in type_sequence
     ]
@@ -72,6 +104,10 @@ class ColumnTypeItemCollector(ItemCollector):
   __distance_matrix = _make_type_distance_matrix(__type_sequence)
   __transformers = (toint, tofloat, str)
 
+  collect_cost = 3
+
+  norm_cost = 0
+
 
   @staticmethod
   def __get_set_length(x):
@@ -115,6 +151,40 @@ class ColumnTypeItemCollector(ItemCollector):
       self.__type_index += 1
 
 
+  def collect_batch(self, items, collector_set = None):
+    """Does the same as 'collect' for every item, but skips the remaining
+    items once the type is str and looks up the decimal info of items in a
+    cache."""
+    assert not self.has_collected
+    type_index = self.__type_index
+    if type_index == 2:
+      return
+
+    max_invalid_absolute = self.max_invalid_absolute
+    max_invalid_relative = self.max_invalid_relative
+    try:
+      for item in items:
+        if type_index <= 0: # none or int
+          if item == '-' or item.isdigit():
+            type_index = 0
+            continue
+          type_index = 1
+
+        # float
+        info = cached_decimal_info(item)
+        if info:
+          if not info[2]:
+            continue
+          if info[2] <= max_invalid_absolute and info[2] <= info[1] * max_invalid_relative:
+            self.__tolerance_exceeded_count += 1
+            if not self.__total_max_invalid_absolute < self.__tolerance_exceeded_count:
+              continue
+        type_index = 2
+        break
+    finally:
+      self.__type_index = type_index
+
+
   def get_result(self, collector_set = None):
     assert self.has_collected
     if self.__type_index == 1 and self.__total_max_invalid_absolute is None:
@@ -127,6 +197,26 @@ class ColumnTypeItemCollector(ItemCollector):
     return self.__type_sequence[self.__type_index]
 
 
+  def has_final_result(self):
+    return self.__type_index == len(self.__type_sequence) - 1
+
+
+  def get_estimate(self, count):
+    return str if self.has_final_result() else NotImplemented
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    if (self.__total_max_invalid_absolute is not None and
+      self.__total_max_invalid_absolute < self.__tolerance_exceeded_count
+    ):
+      # The column may have turned out to be of type str only because the
+      # previous items exceeded the lower tolerance for fewer items.
+      return False
+    self.__total_max_invalid_absolute = int(rowcount * self.total_max_invalid)
+    return True
+
+
   def get_transformer(self):
     return self.__transformers[self.__type_index]
 
@@ -199,6 +289,12 @@ class factory(object):
     return not self.__eq__(other)
 
 
+  def __str__(self):
+    return utilities.string.join('factory(',
+      ', '.join(map(collector_name, (self.string_collector, self.numeric_collector))),
+      ')')
+
+
   def __hash__(self):
     return 0x4a9fd98f ^ hash(self.string_collector) ^ hash(self.numeric_collector)
 
@@ -0,0 +1,105 @@
+import numbers
+from utilities import infinity
+from utilities.distribution import DistributionTable
+from .base import ItemCollector
+from .itemcount import ItemCountCollector
+
+
+
+def estimate_change(a, b):
+  """
+  Returns the relative change between two estimates of a collector result.
+
+  :param a: tuple | DistributionTable | numbers.Real | object
+  :param b: same as 'a'
+  :return: float
+  """
+  if isinstance(a, tuple):
+    return max(map(estimate_change, a, b), default=0.0)
+  if isinstance(a, DistributionTable):
+    return a.distance_to(b)
+  if isinstance(a, numbers.Real) and isinstance(b, numbers.Real):
+    if a == b or (a != a and b != b):
+      return 0.0
+    return abs(a - b) / max(abs(a), abs(b))
+  return 0.0 if a == b else infinity
+
+
+
+class ColumnProgress(object):
+  """
+  Counts the items of a column collected in a phase and decides when to stop.
+
+  If 'tolerance' is a number, the estimates of all collectors, that collect
+  items in this phase, are compared at every checkpoint. Collection stops
+  once all collectors have a final result, or once all estimates changed by
+  at most 'tolerance' over 'patience' successive checkpoints. In the latter
+  case the column is limited to the collected items in later phases, too,
+  so all its results describe the same items.
+  """
+
+  def __init__(self, collector_set, tolerance=None, patience=2):
+    super().__init__()
+    self.collector_set = collector_set
+    self.tolerance = tolerance
+    self.patience = patience
+    self.consumed = 0
+    self.isapproximate = False
+    self.__collectors = tuple(
+      collector for collector in collector_set.values()
+      if not collector.has_collected and
+        type(collector).collect is not ItemCollector.collect)
+    self.__estimates = None
+    self.__stable_checkpoints = 0
+
+
+  def remaining(self, count):
+    """
+    :param count: int
+    :return: int the number of the next 'count' items to collect
+    """
+    limit = self.collector_set.row_limit
+    return count if limit is None else min(count, limit - self.consumed)
+
+
+  def add(self, count):
+    """
+    Records a checkpoint after 'count' more collected items.
+
+    :param count: int
+    :return: bool whether to stop collecting this column
+    """
+    self.consumed += count
+    limit = self.collector_set.row_limit
+    if limit is not None and self.consumed >= limit:
+      return True
+    if self.tolerance is None:
+      return False
+    if all(collector.has_final_result() for collector in self.__collectors):
+      return True
+
+    estimates = tuple(
+      collector.get_estimate(self.consumed) for collector in self.__collectors)
+    if any(estimate is NotImplemented for estimate in estimates):
+      return False
+    if (self.__estimates is not None and
+      estimate_change(self.__estimates, estimates) <= self.tolerance
+    ):
+      self.__stable_checkpoints += 1
+    else:
+      self.__stable_checkpoints = 0
+    self.__estimates = estimates
+    self.isapproximate = self.__stable_checkpoints >= self.patience
+    return self.isapproximate
+
+
+  def finish(self):
+    """Limits the column to the collected items if they are a sample."""
+    if self.isapproximate:
+      collector_set = self.collector_set
+      collector_set.row_limit = self.consumed
+      previous_count = collector_set.get(ItemCountCollector)
+      if previous_count is not None:
+        count = ItemCountCollector(self.consumed)
+        count.isdependency = previous_count.isdependency
+        collector_set[ItemCountCollector] = count
@@ -22,6 +22,16 @@ class ItemCountCollector(ItemCollector):
     self.count += 1
 
 
+  def collect_batch(self, items, collector_set = None):
+    assert not self.has_collected
+    self.count += len(items)
+
+
   def get_result(self, collector_set = None):
     assert self.has_collected
     return self.count
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
@@ -1,42 +1,83 @@
-import numbers, operator
-import utilities.iterator, utilities.functional
+import numbers
+from collections import Counter
+from math import isnan
 from .base import ItemCollector
 from .columntype import ColumnTypeItemCollector
 from .itemcount import ItemCountCollector
-from .minitem import MinItemCollector
-from .maxitem import MaxItemCollector
-from .variance import ItemVarianceCollector
-from utilities.distribution import UniformBinDistributionTable, SparseDistributionTable
+from utilities import numeric
+from utilities.distribution import StreamingHistogram, SparseDistributionTable
 
 
 
 class ItemFrequencyCollector(ItemCollector):
+  """
+  Counts the frequencies of the items of a column. Numeric items are counted
+  in a StreamingHistogram, that is resampled to uniform bins (see
+  'UniformBinDistributionTable.for_variance') when the result is requested,
+  so it needs no prior pass to find the value range.
+  """
 
-  pre_dependencies = (ItemCountCollector, MinItemCollector, MaxItemCollector, ItemVarianceCollector)
+  pre_dependencies = (ColumnTypeItemCollector,)
+
+  result_dependencies = (ItemCountCollector,)
+
+  collect_cost = 2
 
 
   def __init__(self, previous_collector_set):
     super().__init__(previous_collector_set)
 
-    if issubclass(previous_collector_set[ColumnTypeItemCollector].get_result(previous_collector_set), numbers.Real):
-      prereqs = list(map(previous_collector_set.get, self.pre_dependencies))
-      if prereqs[-1] is None:
-        del prereqs[-1]
-        table_ctor = UniformBinDistributionTable.for_count
-      else:
-        table_ctor = UniformBinDistributionTable.for_variance
-      assert all(prereqs)
-      utilities.iterator.map_inplace(operator.methodcaller('get_result'), prereqs)
-      prereqs.append('I')
-      self.frequencies = table_ctor(*prereqs)
-    else:
-      self.frequencies = SparseDistributionTable(int)
+    self.__isnumeric = issubclass(
+      previous_collector_set[ColumnTypeItemCollector].get_result(previous_collector_set),
+      numbers.Real)
+    self.frequencies = \
+      StreamingHistogram() if self.__isnumeric else SparseDistributionTable(int)
+    self.__result = None
 
 
   def collect(self, item, collector_set=None):
     if item is not None:
+      if self.__isnumeric and isnan(item):
+        return
       self.frequencies.increase(item)
 
 
+  def collect_batch(self, items, collector_set=None):
+    if self.__isnumeric:
+      self.frequencies.increase_all(numeric.numeric_items(items)[0])
+    else:
+      frequencies = self.frequencies
+      counts = Counter(item for item in items if item is not None)
+      for item, count in counts.items():
+        frequencies[item] += count
+
+
+  def get_estimate(self, count):
+    if self.__isnumeric:
+      if not self.frequencies.count():
+        return NotImplemented
+      return self.frequencies.as_uniform_table(datatype='d') / \
+        self.frequencies.count()
+    return self.frequencies / count
+
+
+  def resume(self, collector_set, rowcount):
+    # The histogram of numeric items doesn't depend on the batching of the
+    # items, so continuing it with the appended ones yields the same as
+    # collecting the whole column anew.
+    super().resume(collector_set, rowcount)
+    self.__result = None
+    if not self.__isnumeric:
+      self.frequencies.index(None)
+    return True
+
+
   def get_result(self, collector_set=None):
-    return self.frequencies
+    if not self.__isnumeric:
+      return self.frequencies
+    if self.__result is None:
+      assert self.has_collected
+      self.__result = self.frequencies.as_uniform_table(
+        None if collector_set is None else
+          collector_set[ItemCountCollector].get_result(collector_set))
+    return self.__result
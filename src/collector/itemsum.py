@@ -1,5 +1,7 @@
 from math import isnan
 from .base import ItemCollector
+import utilities
+from utilities import numeric
 
 
 
@@ -19,5 +21,21 @@ class ItemSumCollector(ItemCollector):
       self.type_error_count += 1
 
 
+  def collect_batch(self, items, collector_set = None):
+    values, invalid_count = numeric.numeric_items(items)
+    self.sum = numeric.total(values, self.sum)
+    self.type_error_count += invalid_count
+
+
   def get_result(self, collector_set = None):
     return self.sum
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
+
+
+  def get_estimate(self, count):
+    count -= self.type_error_count
+    return self.sum / count if count else utilities.NaN
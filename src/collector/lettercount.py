@@ -17,5 +17,19 @@ class ItemLetterCountCollector(ItemCollector):
     self.letter_count += len(item)
 
 
+  def collect_batch(self, items, collector_set = None):
+    assert all(isinstance(item, basestring) for item in items)
+    self.letter_count += sum(map(len, items))
+
+
   def get_result(self, collector_set = None):
     return self.letter_count
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
+
+
+  def get_estimate(self, count):
+    return self.letter_count / count
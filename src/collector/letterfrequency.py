@@ -1,5 +1,5 @@
 from .base import ItemCollector
-from utilities.distribution import SparseDistributionTable
+from utilities.distribution import LetterDistributionTable
 
 if __debug__:
   from utilities.string import basestring
@@ -8,20 +8,36 @@ if __debug__:
 
 class LetterFrequencyCollector(ItemCollector):
 
+  collect_cost = 4
+
+
   def __init__(self, previous_collector_set=None):
     super().__init__(previous_collector_set)
-    self.frequencies = SparseDistributionTable(int)
+    self.frequencies = LetterDistributionTable()
 
 
   def collect(self, item, collector_set=None):
     assert isinstance(item, basestring)
-    for c in item:
-      self.frequencies[c] += 1
+    self.frequencies.increase_all((item,))
+
+
+  def collect_batch(self, items, collector_set=None):
+    assert all(isinstance(item, basestring) for item in items)
+    self.frequencies.increase_all(items)
 
 
   def get_result(self, collector_set=None):
     return self.frequencies
 
 
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
+
+
+  def get_estimate(self, count):
+    return self.frequencies / max(self.frequencies.count(), 1)
+
+
   def as_str(self, collector_set=None, number_fmt=''):
     return format(self.get_result(collector_set), number_fmt)
@@ -1,32 +1,21 @@
 from math import sqrt
-from utilities.operator import square
 from .base import ItemCollector
 from .lettercount import ItemLetterCountCollector
-from .letteraverage import ItemLetterAverageCollector
+from .moments import ItemLetterMomentsCollector
 
 
 
 class LetterVarianceCollector(ItemCollector):
+  """The sum of the squared deviations of the item lengths from their mean
+  per letter"""
 
-  pre_dependencies = (ItemLetterAverageCollector,)
-
-  result_dependencies = (ItemLetterCountCollector,)
-
-
-  def __init__(self, previous_collector_set):
-    super().__init__(previous_collector_set)
-    self.sum_of_squares = 0
-    self.letter_average = \
-      previous_collector_set[ItemLetterAverageCollector] \
-        .get_result(previous_collector_set)
-
-
-  def collect(self, item, collector_set = None):
-    self.sum_of_squares += square(len(item) - self.letter_average)
+  result_dependencies = (ItemLetterMomentsCollector, ItemLetterCountCollector)
 
 
   def get_result(self, collector_set):
-    return self.sum_of_squares / collector_set[ItemLetterCountCollector].get_result()
+    return (
+      collector_set[ItemLetterMomentsCollector].get_result(collector_set).m2 /
+      collector_set[ItemLetterCountCollector].get_result())
 
 
 
@@ -44,5 +33,6 @@ class LetterVariationCoefficient(ItemCollector):
   result_dependencies = (LetterVarianceCollector,)
 
   def get_result(self, collector_set):
-    varcoll = collector_set[LetterVarianceCollector]
-    return sqrt(varcoll.get_result(collector_set)) / varcoll.letter_average
+    return (
+      sqrt(collector_set[LetterVarianceCollector].get_result(collector_set)) /
+      collector_set[ItemLetterMomentsCollector].get_result(collector_set).mean)
@@ -1,5 +1,5 @@
 from .base import ItemCollector
-from utilities import infinity
+from utilities import infinity, numeric
 
 
 
@@ -15,5 +15,18 @@ class MaxItemCollector(ItemCollector):
       self.max = item
 
 
+  def collect_batch(self, items, collector_set = None):
+    values, invalid_count = numeric.numeric_items(items)
+    if invalid_count != items.count(None):
+      super().collect_batch(items, collector_set)
+    else:
+      self.max = max(self.max, numeric.maximum(values, self.max))
+
+
   def get_result(self, collector_set = None):
     return self.max
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
@@ -1,5 +1,5 @@
 from .base import ItemCollector
-from utilities import infinity
+from utilities import infinity, numeric
 
 
 
@@ -15,5 +15,18 @@ class MinItemCollector(ItemCollector):
       self.min = item
 
 
+  def collect_batch(self, items, collector_set = None):
+    values, invalid_count = numeric.numeric_items(items)
+    if invalid_count != items.count(None):
+      super().collect_batch(items, collector_set)
+    else:
+      self.min = min(self.min, numeric.minimum(values, self.min))
+
+
   def get_result(self, collector_set = None):
     return self.min
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
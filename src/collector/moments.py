@@ -0,0 +1,85 @@
+from math import isnan
+from utilities.moments import Moments, HigherMoments
+from utilities import numeric
+from .base import ItemCollector
+
+
+
+class ItemMomentsCollector(ItemCollector):
+  """Accumulates the mean and variance of the numeric items in one pass"""
+
+  moments_type = Moments
+
+
+  def __init__(self, previous_collector_set=None):
+    super().__init__(previous_collector_set)
+    self.moments = self.moments_type()
+
+
+  def collect(self, item, collector_set=None):
+    try:
+      if not isnan(item):
+        self.moments.add(item)
+    except TypeError:
+      pass
+
+
+  def collect_batch(self, items, collector_set=None):
+    numeric.add_moments(self.moments, numeric.numeric_items(items)[0])
+
+
+  def get_result(self, collector_set=None):
+    return self.moments
+
+
+  def resume(self, collector_set, rowcount):
+    super().resume(collector_set, rowcount)
+    return True
+
+
+  def get_estimate(self, count):
+    return self.moments.mean, self.moments.standard_deviation
+
+
+  def merge(self, other):
+    """Adds the moments collected by another collector of the same type."""
+    self.moments.merge(other.moments)
+    return self
+
+
+
+class ItemHigherMomentsCollector(ItemMomentsCollector):
+  """Also accumulates the third and fourth central moments"""
+
+  moments_type = HigherMoments
+
+
+
+class ItemSkewnessCollector(ItemCollector):
+
+  result_dependencies = (ItemHigherMomentsCollector,)
+
+  def get_result(self, collector_set):
+    return collector_set[ItemHigherMomentsCollector].get_result(collector_set).skewness
+
+
+
+class ItemKurtosisCollector(ItemCollector):
+
+  result_dependencies = (ItemHigherMomentsCollector,)
+
+  def get_result(self, collector_set):
+    return collector_set[ItemHigherMomentsCollector].get_result(collector_set).kurtosis
+
+
+
+class ItemLetterMomentsCollector(ItemMomentsCollector):
+  """Accumulates the mean and variance of the item lengths in one pass"""
+
+  def collect(self, item, collector_set=None):
+    self.moments.add(len(item))
+
+
+  def collect_batch(self, items, collector_set=None):
+    numeric.add_moments(self.moments,
+      numeric.numeric_items(tuple(map(len, items)))[0])
@@ -1,33 +1,53 @@
-import copy, collections
-import utilities.iterator as uiterator
-from itertools import filterfalse, zip_longest, islice, chain
+import copy
+import itertools, operator
+from operator import methodcaller
+from itertools import chain
 from functools import partial as partialfn
-from utilities.iterator import each, consume
+from utilities.iterator import each
 from utilities.functional import memberfn, composefn
+from utilities.distribution import Vocabulary, SparseDistributionTable
 
 from .base import ItemCollector
-from .tag import TagCollector
 from .set import ItemCollectorSet
 from .rows import RowCollector
+from .columnstore import ColumnStore
+from .planner import plan_column, isresolved, PhasePlan
 from .itemcount import ItemCountCollector
 from .columntype import ColumnTypeItemCollector
 
-if __debug__:
-  import operator
-
 
 
 class MultiphaseCollector(object):
   """Manages a sequence of collection phases"""
 
-  def __init__(self, rowset, name=None, verbosity=0):
+  def __init__(self, rowset, name=None, verbosity=0, chunk_size=None,
+      tolerance=None):
+    """
+    :param chunk_size: int the number of items of a column to collect at once
+    :param tolerance: float if not None, stop collecting a column once the
+      estimates of its collectors converge within this tolerance (see
+      'collector.convergence.ColumnProgress')
+    """
     self.name = name
     self.verbosity = verbosity
-    self.rowset = rowset if isinstance(rowset, collections.Sequence) else tuple(rowset)
-    #assert operator.eq(*utilities.minmax(map(len, self.rowset)))
+    self.chunk_size = chunk_size
+    self.tolerance = tolerance
+    # the key of the results in a profile cache until they are stored there
+    self.profile_key = None
+    # the size and SHA-256 digest of the schema instance file up to the end
+    # of the collected records, if the profile may be updated incrementally
+    self.profile_source = None
+    self.columns = \
+      rowset if isinstance(rowset, ColumnStore) else ColumnStore(rowset, verbosity)
     self.reset(None)
 
 
+  @property
+  def rowset(self):
+    """A row-wise view of the collected data for row based consumers"""
+    return self.columns.rows
+
+
   def reset(self, keep=(ItemCountCollector, ColumnTypeItemCollector)):
     self.merged_predecessors = \
       RowCollector(self.__emit_itemcollector_set(keep), self.verbosity)
@@ -39,6 +59,7 @@ class MultiphaseCollector(object):
       keep = composefn(type, keep.__contains__)
       for predecessor in self.merged_predecessors:
         ics = ItemCollectorSet()
+        ics.row_limit = predecessor.row_limit
 
         def add_copy_and_dependencies(collector, isdependency):
           for dep in collector.result_dependencies:
@@ -52,18 +73,32 @@ class MultiphaseCollector(object):
           filter(keep, predecessor.values()))
         yield ics
     else:
-      for _ in range(len(self.rowset[0])):
+      for _ in range(self.columns.columncount()):
         ics = ItemCollectorSet()
-        ics.add(ItemCountCollector(len(self.rowset)), True)
+        ics.add(ItemCountCollector(self.columns.rowcount), True)
         yield ics
 
 
-  def do_phases(self, collectorset_description, callback=None):
+  def do_phases(self, collectorset_description, callback=None, cheap_only=False, plan_callback=None):
+    """
+    Collects all phases of a description.
+
+    If 'cheap_only' is set, this stops before the first phase that depends on
+    the results of the previous phases to resolve collector factories (e. g.
+    on the column type), which may then be collected with another call later.
+
+    'plan_callback' receives this collector, the phases planned up to the next
+    collector factory, and the number of preceding phases, whenever phases
+    are planned.
+    """
     phase_count = 0
     while True:
       phase_descriptions = self.get_phase_descriptions(collectorset_description)
-      if __debug__:
-        phase_descriptions = tuple(phase_descriptions)
+      if plan_callback is not None:
+        plan_callback(self, PhasePlan(itertools.takewhile(
+            composefn(self.__contains_factory, operator.not_),
+            phase_descriptions)),
+          phase_count)
 
       for phase_description in phase_descriptions:
         if self.__contains_factory(phase_description):
@@ -75,6 +110,8 @@ class MultiphaseCollector(object):
           callback(self)
       else:
         break
+      if cheap_only:
+        return phase_count
 
     if __debug__:
       for coll_set in self.merged_predecessors:
@@ -93,75 +130,17 @@ class MultiphaseCollector(object):
 
   @staticmethod
   def __contains_factory(phase_desc):
-    return not all((
-      isinstance(ctype, ItemCollector) or
-        (type(ctype) is type and issubclass(ctype, ItemCollector))
-      for ctype in chain(*filter(None, phase_desc))))
+    return not all(map(isresolved, chain(*filter(None, phase_desc))))
 
 
   def get_phase_descriptions(self, collectorset_description):
-    # column-first ordering
-    phase_descriptions = map(
-      partialfn(self.__get_dependency_chain, collectorset_description),
-      self.merged_predecessors)
-    # transpose to phase-first ordering
-    phase_descriptions = zip_longest(*phase_descriptions)
-    return phase_descriptions
-
-
-  def __get_dependency_chain(self, collectorset_description, predecessors=None):
     """
-    Returns a list of phase-wise collector descriptions for a single column.
-
     :param collectorset_description: iterable
-    :param predecessors: ItemCollectorSet
-    :return: list[dict]
+    :return: PhasePlan
     """
-    phase = dict(filterfalse(
-      lambda item: item[0] is None or item[0] in predecessors,
-      ((template.get_type(predecessors), template)
-        for template in collectorset_description)))
-    independent = TagCollector('independent', frozenset(phase.keys()), True)
-
-    phases = []
-    collector_min_phases = dict()
-    phase_pre_dependencies = None
-    phase_result_dependencies = set()
-
-    def must_add_dependency(dep):
-      return (dep not in phase and
-        dep not in phase_result_dependencies and
-        dep not in phase_pre_dependencies)
-
-    def add_dependencies(template):
-      if template.pre_dependencies:
-        for dep in filterfalse(predecessors.__contains__, template.pre_dependencies):
-          phase_pre_dependencies.setdefault(dep, dep)
-          collector_min_phases[dep] = len(phases) - 1
-      else:
-        for dep in filter(must_add_dependency, template.result_dependencies):
-          add_dependencies(dep)
-          phase_result_dependencies.add(dep)
-
-    # resolve dependencies and push them to an earlier phase
-    while phase:
-      phase_pre_dependencies = dict()
-      phase_result_dependencies.clear()
-      each(add_dependencies, phase.keys())
-      phases.append(phase)
-      phase = phase_pre_dependencies
-
-    # remove later duplicates
-    consume((
-      each(memberfn(dict.pop, ctype, None), islice(phases, 0, -min_phase_idx))
-      for ctype, min_phase_idx in collector_min_phases.items()))
-
-    if predecessors is not None:
-      predecessors[independent] = independent
-    elif phases:
-      phases[-1][independent] = independent
-
-    return uiterator.filter(None, reversed(phases))
+    return PhasePlan.from_columns(map(
+      partialfn(plan_column, collectorset_description),
+      self.merged_predecessors))
 
 
   def do_phase(self, phase_description):
@@ -170,9 +149,10 @@ class MultiphaseCollector(object):
 
 
   def __do_phase_magic(self, itemcollector_sets):
-    phase = RowCollector(itemcollector_sets, self.verbosity)
-    phase.collect_all(self.rowset)
-    phase.transform_all(self.rowset)
+    phase = RowCollector(itemcollector_sets, self.verbosity, self.chunk_size,
+      self.tolerance)
+    phase.collect_columns(self.columns)
+    phase.transform_columns(self.columns)
     self.merged_predecessors = phase
 
 
@@ -183,15 +163,87 @@ class MultiphaseCollector(object):
     return len(self.merged_predecessors)
 
 
-  def results_norms(a, b, weights=None):
+  def results_norms(a, b, weights=None, cutoff=None, max_norm_cost=None):
     """
     :param a: self
     :param b: MultiphaseCollector
+    :param cutoff: float | list[list[float]] | None (see
+      'collector.normmatrix.norm_matrix')
     :return: list[list[float]]
     """
-    return a.merged_predecessors.results_norms(b.merged_predecessors, weights)
+    return a.merged_predecessors.results_norms(
+      b.merged_predecessors, weights, cutoff, max_norm_cost)
+
+
+  @staticmethod
+  def index_distributions(collectors, vocabulary=None):
+    """
+    Indexes the sparse distribution tables among the results of all columns
+    of all collectors with a common vocabulary, so the norms of all column
+    pairs compare them as aligned vectors instead of looking up their
+    events again for every pair (see 'SparseDistributionTable.index').
+
+    :param collectors: iterable[MultiphaseCollector]
+    :param vocabulary: Vocabulary
+    :return: Vocabulary
+    """
+    if vocabulary is None:
+      vocabulary = Vocabulary()
+    for collector in collectors:
+      for collector_set in collector.merged_predecessors:
+        for coll in collector_set.values():
+          if not coll.isdependency:
+            result = coll.get_result(collector_set)
+            if isinstance(result, SparseDistributionTable):
+              result.index(vocabulary)
+    return vocabulary
+
+
+  @staticmethod
+  def prune_incompatible_columns(collectors):
+    """
+    Marks the columns of every collector, that are incompatible to all
+    columns of all other collectors, as pruned. Later phases skip pruned
+    columns and their norms are maximal.
+
+    :param collectors: list[MultiphaseCollector]
+    :return: list[list[int]] the indices of the newly pruned columns of each
+      collector
+    """
+    pruned_columns = []
+    for a in collectors:
+      others = [b.merged_predecessors for b in collectors if b is not a]
+      pruned = [
+        column_idx
+        for column_idx, a_set in enumerate(a.merged_predecessors)
+        if not a_set.ispruned() and not any((
+          a_set.iscompatible(b_set) for b in others for b_set in b))]
+      for column_idx in pruned:
+        a.merged_predecessors[column_idx].prune()
+      pruned_columns.append(pruned)
+    return pruned_columns
+
+
+  def view(self, collectorset_description):
+    """
+    Returns a collector with the results of a description, that this
+    collector has collected as part of a larger one (see
+    'ItemCollectorSet.view'). It shares the columns and the collected data
+    with this collector.
+
+    :param collectorset_description: iterable
+    :return: MultiphaseCollector
+    """
+    result = self.copy()
+    phase = self.merged_predecessors
+    result.merged_predecessors = RowCollector(
+      map(methodcaller('view', collectorset_description), phase),
+      self.verbosity)
+    result.merged_predecessors.consumed_rows = phase.consumed_rows
+    return result
 
 
   def copy(self):
     return MultiphaseCollector(
-      copy.deepcopy(self.rowset), self.name, self.verbosity)
+      self.columns.copy(), self.name, self.verbosity, self.chunk_size,
+      self.tolerance)
@@ -0,0 +1,159 @@
+from math import fsum
+import utilities, utilities.operator as uoperator
+from utilities import numeric
+from .base import ItemCollector
+from .set import ItemCollectorSet
+from .weight import WeightDict
+
+
+
+def norm_matrix(a, b, weights=None, cutoff=None, max_norm_cost=None):
+  """
+  Returns the norms of all pairs of the column collector sets of two
+  phases, that equal those of 'ItemCollectorSet.result_norm' for every
+  pair.
+
+  Instead of pair by pair, the norms are computed collector type by
+  collector type: the results of a type are taken from all columns once,
+  its distances for all column pairs are computed at once, as an array of
+  absolute differences for plain numeric results, and weighted element-wise.
+  Finally the weighted distances of the types of every pair are summed.
+
+  The types are compared in the order of their 'norm_cost', cheapest first.
+  With a 'cutoff' the remaining types of a pair are skipped, once the norm
+  of its weighted distances so far exceeds the cutoff of that pair; its
+  result is then that partial norm, which is a lower bound of its norm as
+  long as the weighted distances aren't negative. Types with a 'norm_cost'
+  above 'max_norm_cost' aren't compared at all, which yields such lower
+  bounds for all pairs.
+
+  :param a: sequence[ItemCollectorSet]
+  :param b: sequence[ItemCollectorSet]
+  :param weights: WeightDict
+  :param cutoff: float | list[list[float]] | None a cutoff for all pairs or
+    for every pair in the shape of the result
+  :param max_norm_cost: float | None
+  :return: list[list[float]] the norms of the columns of 'a' (inner) to
+    those of 'b' (outer)
+  """
+  if weights is None:
+    weights = WeightDict()
+  if cutoff is not None and not isinstance(cutoff, list):
+    cutoff = [[cutoff] * len(a) for _ in b]
+
+  # the collector types to compare of every column of 'a' and the pairs to
+  # compare at all
+  a_types = [
+    [ctype for ctype, collector in a_set.items() if not collector.isdependency]
+    for a_set in a]
+  compared = [
+    [not a_set.ispruned() and not b_set.ispruned() and
+        utilities.issubset(a_set.keys(), b_set)
+      for a_set in a]
+    for b_set in b]
+
+  sum_outer = weights.sum_data[1]
+  weight_sums = [
+    _weight_sum(a_set, types, weights) for a_set, types in zip(a, a_types)]
+  # the pairs, whose norms haven't exceeded their cutoff yet
+  pending = compared if cutoff is None else list(map(list, compared))
+
+  terms = [[[] for _ in a] for _ in b]
+  columns_by_type = _columns_by_type(a_types)
+  norm_costs = {
+    ctype: a[columns[0]][ctype].norm_cost
+    for ctype, columns in columns_by_type.items()}
+  for ctype in sorted(columns_by_type, key=norm_costs.__getitem__):
+    if max_norm_cost is not None and norm_costs[ctype] > max_norm_cost:
+      break
+    pairs = _add_terms(
+      terms, pending, a, b, ctype, columns_by_type[ctype], weights)
+    if cutoff is not None:
+      for a_idx, b_idx in pairs:
+        if (_normalize(sum_outer(fsum(terms[b_idx][a_idx])),
+            weight_sums[a_idx], weights)
+          > cutoff[b_idx][a_idx]
+        ):
+          pending[b_idx][a_idx] = False
+
+  default = weights[ItemCollectorSet].coefficient
+  return [
+    [_normalize(sum_outer(fsum(pair_terms)), weight_sum, weights)
+        if is_compared else default
+      for pair_terms, is_compared, weight_sum
+      in zip(b_terms, b_compared, weight_sums)]
+    for b_terms, b_compared in zip(terms, compared)]
+
+
+def _columns_by_type(a_types):
+  """
+  :return: dict[type, list[int]] the columns of 'a', that compare each type
+  """
+  columns = dict()
+  for column_idx, types in enumerate(a_types):
+    for ctype in types:
+      columns.setdefault(ctype, []).append(column_idx)
+  return columns
+
+
+def _add_terms(terms, compared, a, b, ctype, a_columns, weights):
+  """
+  Appends the weighted distances of a collector type of all compared pairs
+  of the given columns of 'a' and all columns of 'b' to their terms.
+
+  :return: list[(int, int)] the compared pairs
+  """
+  pairs = [
+    (a_idx, b_idx)
+    for b_idx, b_compared in enumerate(compared)
+    for a_idx in a_columns if b_compared[a_idx]]
+  if not pairs:
+    return pairs
+
+  a_results = {
+    a_idx: a[a_idx][ctype].get_result(a[a_idx])
+    for a_idx in set(map(uoperator.first, pairs))}
+  b_results = {
+    b_idx: b[b_idx][ctype].get_result(b[b_idx])
+    for b_idx in set(map(uoperator.second, pairs))}
+  collector = a[a_columns[0]][ctype]
+  assert all(type(a[a_idx][ctype]) is type(collector) for a_idx in a_columns)
+  weight = weights[type(collector)]
+  sum_inner = weights.sum_data[0]
+
+  if (type(collector).result_norm is ItemCollector.result_norm and
+    all(type(result) is float
+      for results in (a_results, b_results) for result in results.values())
+  ):
+    a_order = sorted(a_results)
+    b_order = sorted(b_results)
+    differences = numeric.abs_difference_matrix(
+      list(map(a_results.__getitem__, a_order)),
+      list(map(b_results.__getitem__, b_order)))
+    a_pos = {a_idx: pos for pos, a_idx in enumerate(a_order)}
+    b_pos = {b_idx: pos for pos, b_idx in enumerate(b_order)}
+    for a_idx, b_idx in pairs:
+      terms[b_idx][a_idx].append(
+        sum_inner(weight(differences[b_pos[b_idx]][a_pos[a_idx]])))
+  else:
+    result_norm = collector.result_norm
+    for a_idx, b_idx in pairs:
+      terms[b_idx][a_idx].append(
+        sum_inner(weight(result_norm(a_results[a_idx], b_results[b_idx]))))
+  return pairs
+
+
+def _weight_sum(a_set, types, weights):
+  total = 0
+  for ctype in types:
+    total += weights[type(a_set[ctype])].coefficient
+  return total
+
+
+def _normalize(value_sum, weight_sum, weights):
+  if value_sum:
+    assert weight_sum > 0
+    assert not 'normalized' in weights.tags or abs(value_sum / weight_sum) <= 1
+    return value_sum / weight_sum
+  else:
+    return utilities.NaN
@@ -0,0 +1,183 @@
+import collections
+from math import fsum
+from itertools import chain, zip_longest, filterfalse
+from utilities.functional import memberfn
+
+from .base import ItemCollector
+from .tag import TagCollector
+
+
+
+def plan_column(collectorset_description, predecessors=None):
+  """
+  Returns a list of phase-wise collector descriptions for a single column.
+
+  Every collector is scheduled in the earliest phase after all its
+  pre-dependencies, so the number of phases is the length of the longest
+  chain of pre-dependencies, which is the least possible. Result
+  dependencies are collected no later than their dependants; those of
+  collector factories are unknown until the factory is resolved in a later
+  plan.
+
+  :param collectorset_description: iterable
+  :param predecessors: ItemCollectorSet
+  :return: tuple[dict]
+  """
+  if predecessors is None:
+    collected = ()
+  elif predecessors.ispruned():
+    return ()
+  else:
+    collected = predecessors
+
+  requested = collections.OrderedDict(filterfalse(
+    lambda item: item[0] is None or item[0] in collected,
+    ((template.get_type(predecessors), template)
+      for template in collectorset_description)))
+  independent = TagCollector('independent', frozenset(requested.keys()), True)
+
+  levels = dict()
+  templates = collections.OrderedDict()
+
+  def schedule(ctype, template, explicit):
+    level = levels.get(ctype)
+    if level is None:
+      level = max(chain((0,),
+        (schedule(dep, dep, True) + 1
+          for dep in filterfalse(collected.__contains__,
+            ctype.pre_dependencies)),
+        (schedule(dep, dep, False)
+          for dep in filterfalse(collected.__contains__,
+            ctype.result_dependencies if isresolved(ctype) else ()))))
+      levels[ctype] = level
+    if explicit:
+      templates.setdefault(ctype, template)
+    return level
+
+  for ctype, template in requested.items():
+    schedule(ctype, template, True)
+
+  phases = [collections.OrderedDict() for _ in
+    range(max(levels.values(), default=-1) + 1)]
+  for ctype, template in templates.items():
+    phases[levels[ctype]][ctype] = template
+
+  if predecessors is not None:
+    predecessors[independent] = independent
+  elif phases:
+    phases[-1][independent] = independent
+
+  return tuple(phases)
+
+
+
+def merge_descriptions(collectorset_descriptions):
+  """
+  Returns the union of several collector set descriptions, so their common
+  collectors are collected only once. Every template occurs once in the
+  order of its first occurrence.
+
+  The results of each description can then be taken from the collector sets
+  of the union (see 'ItemCollectorSet.view').
+
+  :param collectorset_descriptions: iterable[iterable]
+  :return: tuple
+  """
+  union = []
+  for template in chain.from_iterable(collectorset_descriptions):
+    if template not in union:
+      union.append(template)
+  return tuple(union)
+
+
+def isresolved(template):
+  """Returns False for collector factories, that need the results of
+  previous phases to resolve to an actual collector type."""
+  return (isinstance(template, ItemCollector) or
+    (isinstance(template, type) and issubclass(template, ItemCollector)))
+
+
+
+def collect_cost(ctype):
+  """
+  :param ctype: type | ItemCollector | callable
+  :return: float the estimated relative cost of collecting a single item
+  """
+  if isinstance(ctype, TagCollector):
+    return 0
+  if not isresolved(ctype):
+    return ItemCollector.collect_cost
+  if not isinstance(ctype, type):
+    ctype = type(ctype)
+  return 0 if ctype.collect is ItemCollector.collect else ctype.collect_cost
+
+
+
+class PhasePlan(tuple):
+  """The collector descriptions of all columns phase by phase"""
+
+
+  @staticmethod
+  def from_columns(column_plans):
+    """
+    :param column_plans: iterable[sequence[dict]] column-wise phase plans as
+      returned by 'plan_column'
+    :return: PhasePlan
+    """
+    return PhasePlan(zip_longest(*column_plans))
+
+
+  def estimate_costs(self, rowcount, predecessors=()):
+    """
+    Estimates the cost of every phase as the product of the row count and
+    the per-item cost of all collectors to collect in that phase, including
+    implicit result dependencies.
+
+    :param rowcount: int
+    :param predecessors: sequence[ItemCollectorSet]
+    :return: list[float]
+    """
+    planned = [set(pred.keys()) for pred in predecessors]
+    costs = []
+    for phase in self:
+      planned.extend(set() for _ in range(len(phase) - len(planned)))
+      costs.append(rowcount * fsum(
+        collect_cost(ctype)
+        for column_desc, column_planned in zip(phase, planned)
+        if column_desc
+        for ctype in self.__expand(column_desc, column_planned)))
+    return costs
+
+
+  @staticmethod
+  def __expand(column_desc, planned):
+    pending = list(column_desc.keys())
+    while pending:
+      ctype = pending.pop()
+      if ctype not in planned:
+        planned.add(ctype)
+        yield ctype
+        pending.extend(getattr(ctype, 'result_dependencies', ()))
+
+
+  def as_str(self, rowcount, predecessors=(), number_format='', first_phase=0):
+    """
+    Lists the estimated cost and the collectors of every column of every
+    phase.
+    """
+    return '\n'.join(chain.from_iterable(
+      chain(
+        ('phase {}: estimated cost {:{}}'.format(
+          phase_idx, cost, number_format),),
+        ('  column {}: {}'.format(column_idx,
+            ', '.join(map(collector_name,
+              filterfalse(memberfn(isinstance, TagCollector), column_desc))))
+          for column_idx, column_desc in enumerate(phase, 1) if column_desc))
+      for phase_idx, phase, cost in zip(
+        range(first_phase + 1, first_phase + 1 + len(self)), self,
+        self.estimate_costs(rowcount, predecessors))))
+
+
+
+def collector_name(ctype):
+  return ctype.__name__ if isinstance(ctype, type) else str(ctype)
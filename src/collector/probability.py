@@ -6,6 +6,9 @@ class BaseProbabilityCollector(ItemCollector):
 
   # result_dependencies = (*CountCollector, *FrequencyCollector)
 
+  # distances of distributions
+  norm_cost = 8
+
 
   def __init__(self, previous_collector_set):
     super().__init__(previous_collector_set)
@@ -21,6 +24,11 @@ class BaseProbabilityCollector(ItemCollector):
     return self.__cached_result
 
 
+  def resume(self, collector_set, rowcount):
+    self.__cached_result = None
+    return super().resume(collector_set, rowcount)
+
+
   def as_str(self, collector_set, number_fmt=''):
     return format(self.get_result(collector_set), number_fmt)
 
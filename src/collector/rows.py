@@ -1,17 +1,36 @@
 import utilities.operator as uoperator
-from operator import methodcaller
+from operator import methodcaller, attrgetter, itemgetter
+from itertools import filterfalse, islice
 from utilities.iterator import each
+from utilities.functional import composefn
 from utilities.string import join
+from .convergence import ColumnProgress
+from .normmatrix import norm_matrix
 
 
 
 class RowCollector(list):
   """Manages collectors for a set of rows"""
 
-  def __init__(self, initialiser, verbosity=0):
+  # the number of items of a column passed to the collectors at once
+  chunk_size = 4096
+
+
+  def __init__(self, initialiser, verbosity=0, chunk_size=None, tolerance=None):
     list.__init__(self, initialiser)
 
+    if chunk_size is not None:
+      assert chunk_size > 0
+      self.chunk_size = chunk_size
+    # stop collecting columns early if their estimates converge within this
+    # tolerance after every chunk (see ColumnProgress)
+    self.tolerance = tolerance
+    # the number of items collected of each column in this phase, or None
+    # for columns without collectors in this phase
+    self.consumed_rows = None
+
     self.__rowcount = 0
+    self.__collect_plan = None
     if verbosity >= 2:
       import sys
       self.__stderr = sys.stderr
@@ -22,10 +41,36 @@ class RowCollector(list):
   def reset(self, collectors):
     self[:] = collectors
     self.__rowcount = 0
+    self.__collect_plan = None
+
+
+  def compile(self):
+    """
+    Fixes the columns to collect in this phase and the collectors of each of
+    them. Columns without collectors, e. g. pruned ones, are skipped.
+
+    :return: tuple[(int, ItemCollectorSet)] the active columns
+    """
+    active_columns = tuple(filterfalse(
+      composefn(uoperator.second, attrgetter('has_collected')),
+      enumerate(self)))
+    for _, collector in active_columns:
+      collector.compile()
+    self.__collect_plan = tuple(
+      (column_idx, collector.collect) for column_idx, collector in active_columns)
+    return active_columns
 
 
   def collect(self, items):
     """Collects the data of all columns of a row"""
+    self.__check_row(items)
+    if self.__collect_plan is None:
+      self.compile()
+    for column_idx, collect in self.__collect_plan:
+      collect(items[column_idx])
+
+
+  def __check_row(self, items):
     if self.__stderr is not None and len(self) != len(items):
       self.__rowcount += 1
       print(
@@ -34,16 +79,92 @@ class RowCollector(list):
         file=self.__stderr)
 
     assert len(self) <= len(items)
-    each(self.__collect_column, self, items)
 
 
-  @staticmethod
-  def __collect_column(collector, item):
-    collector.collect(item, collector)
+  def __track_progress(self, active_columns):
+    return [
+      (column_idx, collector, ColumnProgress(collector, self.tolerance))
+      for column_idx, collector in active_columns]
+
+
+  def __finish(self, progress):
+    self.consumed_rows = [None] * len(self)
+    for column_idx, _, column_progress in progress:
+      column_progress.finish()
+      self.consumed_rows[column_idx] = column_progress.consumed
+    self.set_collected()
 
 
   def collect_all(self, rows):
-    each(self.collect, rows)
+    """
+    Collects rows in chunks of 'chunk_size' rows. The pass ends early when
+    all columns have converged or reached their row limit.
+    """
+    progress = self.__track_progress(self.compile())
+    active_columns = list(progress)
+    rows = iter(rows)
+    chunk = tuple(islice(rows, self.chunk_size))
+    while chunk and active_columns:
+      each(self.__check_row, chunk)
+      for entry in tuple(active_columns):
+        column_idx, collector, column_progress = entry
+        items = tuple(map(itemgetter(column_idx),
+          chunk[:column_progress.remaining(len(chunk))]))
+        collector.collect_batch(items)
+        if column_progress.add(len(items)):
+          active_columns.remove(entry)
+      chunk = tuple(islice(rows, self.chunk_size))
+    self.__finish(progress)
+
+
+  def collect_columns(self, columns):
+    """
+    Collects whole columns of column-major data at once instead of row by
+    row.
+
+    :param columns: ColumnStore
+    """
+    assert len(self) <= len(columns)
+    progress = self.__track_progress(self.compile())
+    chunk_size = self.chunk_size
+    for column_idx, collector, column_progress in progress:
+      items = columns[column_idx]
+      if self.tolerance is None and collector.row_limit is None:
+        collector.collect_column(items, chunk_size)
+        column_progress.add(len(items))
+      else:
+        for start in range(0, len(items), chunk_size):
+          chunk = items[start : start + column_progress.remaining(chunk_size)]
+          collector.collect_batch(chunk)
+          if column_progress.add(len(chunk)):
+            break
+    self.__finish(progress)
+
+
+  def resume_columns(self, columns, rowcount):
+    """
+    Collects rows appended to those collected in this phase (see
+    'ItemCollectorSet.resume_column').
+
+    :param columns: ColumnStore the appended rows
+    :param rowcount: int the number of rows including the appended ones
+    :return: bool False, if some column must be collected anew
+    """
+    assert len(self) <= len(columns)
+    for column_idx, collector in enumerate(self):
+      if not collector.resume_column(
+        columns[column_idx], rowcount, self.chunk_size
+      ):
+        return False
+    if self.consumed_rows is not None:
+      self.consumed_rows = [
+        None if consumed is None else consumed + columns.rowcount
+        for consumed in self.consumed_rows]
+    return True
+
+
+  def set_collected(self):
+    self.__collect_plan = None
     each(methodcaller('set_collected'), self)
 
 
@@ -76,15 +197,32 @@ class RowCollector(list):
       each(methodcaller('set_transformed'), self)
 
 
-  def results_norms(a, b, weights=None):
-    get_result = methodcaller('get_result')
-    # Materialise results of inner loop because they'll be scanned multiple times.
-    resultsA = tuple(map(get_result, a))
-    resultsB = map(get_result, b)
-    return [
-      [collB.result_norm(resultA, resultB, weights) for resultA in resultsA]
-      for collB, resultB in zip(b, resultsB)
-    ]
+  def transform_columns(self, columns):
+    """
+    Replaces the columns of column-major data with their transformed items.
+
+    :param columns: ColumnStore
+    """
+    transformed = False
+    for column_idx, collector in enumerate(self):
+      transformer = collector.get_transformer()
+      if transformer is not None:
+        columns.transform(column_idx, transformer)
+        transformed = True
+    if transformed:
+      each(methodcaller('set_transformed'), self)
+
+
+  def results_norms(a, b, weights=None, cutoff=None, max_norm_cost=None):
+    """
+    :param a: self
+    :param b: RowCollector
+    :param weights: WeightDict
+    :param cutoff: float | list[list[float]] | None
+    :return: list[list[float]] the norms of all column pairs (see
+      'collector.normmatrix.norm_matrix')
+    """
+    return norm_matrix(a, b, weights, cutoff, max_norm_cost)
 
 
   def as_str(self, format_spec=''):
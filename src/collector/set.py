@@ -1,12 +1,11 @@
-import collections, inspect
+import collections, inspect, copy
 from operator import methodcaller, attrgetter
 from .base import ItemCollector
+from .tag import TagCollector
 from .weight import WeightDict
 import utilities
-import utilities.operator as uoperator
 from itertools import filterfalse
 from utilities.iterator import each
-from utilities.functional import composefn
 from utilities.string import join
 
 
@@ -19,19 +18,126 @@ class ItemCollectorSet(ItemCollector, collections.OrderedDict):
     collections.OrderedDict.__init__(self)
 
     self.predecessor = predecessor
+    # the number of leading items of the column to collect; None means all
+    self.row_limit = None if predecessor is None else predecessor.row_limit
+    self.__collect_plan = None
+    self.__batch_plan = None
     if predecessor:
       assert all(map(attrgetter('has_collected'), predecessor.values()))
       self.update(predecessor)
     each(self.add, collectors)
 
 
+  def compile(self):
+    """
+    Binds the collect methods of all collectors, that haven't collected yet,
+    in order. The set of collectors must not change until 'set_collected'.
+
+    :return: self
+    """
+    collectors = tuple(filterfalse(attrgetter('has_collected'), self.values()))
+    self.__collect_plan = tuple(map(attrgetter('collect'), collectors))
+    self.__batch_plan = tuple(map(attrgetter('collect_batch'), collectors))
+    return self
+
+
   def collect(self, item, collector_set = None):
-    assert collector_set is self
-    collect = ItemCollector.collect
-    collect(self, item, self)
-    each(methodcaller('collect', item, self),
-      filterfalse(attrgetter('has_collected'),
-        self.values()))
+    assert collector_set is None or collector_set is self
+    if self.__collect_plan is None:
+      self.compile()
+    for collect in self.__collect_plan:
+      collect(item, self)
+
+
+  def collect_batch(self, items, collector_set = None):
+    """
+    Collects a sequence of items with one collector after the other, so
+    dependencies have collected every item before their dependants.
+    """
+    assert collector_set is None or collector_set is self
+    if self.__batch_plan is None:
+      self.compile()
+    for collect_batch in self.__batch_plan:
+      collect_batch(items, self)
+
+
+  def collect_column(self, items, chunk_size=None):
+    """
+    Collects all items of a column in batches of at most 'chunk_size' items,
+    or in a single batch if it is None.
+
+    :param items: list
+    :param chunk_size: int
+    """
+    if chunk_size is None or len(items) <= chunk_size:
+      self.collect_batch(items)
+    else:
+      for start in range(0, len(items), chunk_size):
+        self.collect_batch(items[start:start+chunk_size])
+
+
+  def resume_column(self, items, rowcount, chunk_size=None):
+    """
+    Collects items appended to the column, that this set has collected
+    completely, e. g. the new records of an append-only schema instance.
+
+    Collectors with a transformer and their result dependencies collect the
+    appended items as read, all others collect the transformed items, like
+    in the phases of a MultiphaseCollector.
+
+    :param items: list the appended items
+    :param rowcount: int the number of items of the column including the
+      appended ones
+    :param chunk_size: int
+    :return: bool False, if the results would differ from those of
+      collecting the whole column anew; the results of this set are then
+      undefined.
+    """
+    if self.row_limit is not None or not all(
+      [collector.resume(self, rowcount) for collector in self.values()]
+    ):
+      return False
+
+    first = set()
+    def add_first(collector_type):
+      if collector_type not in first:
+        first.add(collector_type)
+        each(add_first, self[collector_type].result_dependencies)
+    transformers = [
+      (collector_type, collector.get_transformer())
+      for collector_type, collector in self.items()
+      if not isinstance(collector, TagCollector)]
+    each(add_first, (
+      collector_type for collector_type, transformer in transformers
+      if transformer is not None))
+
+    def collect_all(collectors, items):
+      if chunk_size is None:
+        chunks = (items,)
+      else:
+        chunks = [
+          items[start:start+chunk_size]
+          for start in range(0, len(items), chunk_size)]
+      for collector in collectors:
+        for chunk in chunks:
+          collector.collect_batch(chunk, self)
+
+    collect_all(
+      [collector for collector_type, collector in self.items()
+        if collector_type in first],
+      items)
+    for collector_type, transformer in transformers:
+      if self[collector_type].get_transformer() is not transformer:
+        return False
+      if transformer is not None:
+        items = list(map(transformer, items))
+    collect_all(
+      [collector for collector_type, collector in self.items()
+        if collector_type not in first],
+      items)
+
+    self.set_collected()
+    return True
 
 
   class __result_type(object):
@@ -44,11 +150,17 @@ class ItemCollectorSet(ItemCollector, collections.OrderedDict):
       collector_set = self.__collector_set
       return map(methodcaller('get_result', collector_set), collector_set.values())
 
-    def __cmp__(self, other, weights = WeightDict()):
+    def __cmp__(self, other, weights = WeightDict(), cutoff = None):
+      """
+      With a 'cutoff' the collectors are compared in the order of their
+      'norm_cost', cheapest first, and the norm of the weighted distances so
+      far is returned as soon as it exceeds the cutoff. It is a lower bound
+      of the norm as long as the weighted distances aren't negative.
+      """
       assert isinstance(other, type(self))
       a = self.__collector_set
       b = other.__collector_set
-      if not utilities.issubset(a.keys(), b):
+      if a.ispruned() or b.ispruned() or not utilities.issubset(a.keys(), b):
         return weights[ItemCollectorSet].coefficient
 
       def distance_of_unweighted(a_coll):
@@ -67,8 +179,19 @@ class ItemCollectorSet(ItemCollector, collections.OrderedDict):
           weight_sum.value += weight.coefficient
           return weight(distance_of_unweighted(a_coll))
 
-      value_sum = weights.sum(map(distance_of,
-        filterfalse(attrgetter('isdependency'), a.values())))
+      a_colls = filterfalse(attrgetter('isdependency'), a.values())
+      if cutoff is None:
+        value_sum = weights.sum(map(distance_of, a_colls))
+      else:
+        a_colls = sorted(a_colls, key=attrgetter('norm_cost'))
+        total_weight = sum(weights[type(a_coll)].coefficient for a_coll in a_colls)
+        distances = []
+        value_sum = weights.sum(distances)
+        for a_coll in a_colls:
+          distances.append(distance_of(a_coll))
+          value_sum = weights.sum(distances)
+          if value_sum and value_sum / total_weight > cutoff:
+            return value_sum / total_weight
       if value_sum:
         assert weight_sum.value > 0
         assert not 'normalized' in weights.tags or abs(value_sum / weight_sum.value) <= 1
@@ -77,7 +200,10 @@ class ItemCollectorSet(ItemCollector, collections.OrderedDict):
         return utilities.NaN
 
 
-  def set_collected(self): self.__forward_call()
+  def set_collected(self):
+    self.__collect_plan = None
+    self.__batch_plan = None
+    self.__forward_call()
 
   def set_transformed(self): self.__forward_call()
 
@@ -100,11 +226,18 @@ class ItemCollectorSet(ItemCollector, collections.OrderedDict):
 
 
   def get_transformer(self):
-    transformer = composefn(*filter(None,
+    transformers = tuple(filter(None,
       map(methodcaller('get_transformer'),
         filterfalse(attrgetter('has_transformed'),
           self.values()))))
-    return None if transformer is uoperator.identity else transformer
+    if len(transformers) <= 1:
+      return transformers[0] if transformers else None
+
+    def transformer(item):
+      for transform in transformers:
+        item = transform(item)
+      return item
+    return transformer
 
 
   def as_str(self, collector_set=None, format_spec=''):
@@ -121,6 +254,71 @@ class ItemCollectorSet(ItemCollector, collections.OrderedDict):
   def __str__(self): return self.as_str()
 
 
+  def prune(self):
+    """Marks this column as incompatible to all columns it may be compared to."""
+    pruned_tag = TagCollector('pruned', None, True)
+    self[pruned_tag] = pruned_tag
+
+
+  def ispruned(self):
+    return 'pruned' in self
+
+
+  def iscompatible(self, other):
+    """
+    Returns False, if the results of any collector present in both sets rule
+    out a match of their columns, i. e. their norm is infinite.
+
+    :param other: ItemCollectorSet
+    :return: bool
+    """
+    for collector_type, a_coll in self.items():
+      b_coll = other.get(collector_type)
+      if (b_coll is not None and not isinstance(a_coll, TagCollector) and
+        a_coll.result_norm(a_coll.get_result(self), b_coll.get_result(other))
+          == utilities.infinity
+      ):
+        return False
+    return True
+
+
+  def view(self, collectorset_description):
+    """
+    Returns a set of the collectors of this set, that a description
+    requests, and of their result dependencies, with the same 'isdependency'
+    flags as if this set had been collected for that description alone.
+    This set must contain all of them, e. g. because it was collected for a
+    union of descriptions (see 'collector.planner.merge_descriptions').
+
+    The collectors of the view are shallow copies, that share the collected
+    data with those of this set.
+
+    :param collectorset_description: iterable
+    :return: ItemCollectorSet
+    """
+    independent = frozenset(filter(None,
+      map(methodcaller('get_type', self), collectorset_description)))
+    included = set()
+    def include(collector_type):
+      if collector_type not in included:
+        included.add(collector_type)
+        each(include, self[collector_type].result_dependencies)
+    each(include, independent)
+
+    result = ItemCollectorSet()
+    result.row_limit = self.row_limit
+    for collector_type, collector in self.items():
+      if collector_type in included:
+        collector = copy.copy(collector)
+        collector.isdependency = collector_type not in independent
+        result[collector_type] = collector
+      elif collector_type == 'pruned':
+        result[collector_type] = collector
+    independent_tag = TagCollector('independent', independent, True)
+    result[independent_tag] = independent_tag
+    return result
+
+
   def add(self, template, isdependency=None):
     """Adds an item collector and all its result_dependencies to this set with its type a key,
     if one of the same type isn't in the set already.
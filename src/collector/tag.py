@@ -34,4 +34,6 @@ class TagCollector(ItemCollector):
 
   def get_result(self, collector_set): return None
 
+  def resume(self, collector_set, rowcount): return True
+
   def get_type(self, collector_set): return self
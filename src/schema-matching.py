@@ -13,6 +13,11 @@ def main(argv=None):
       "Warning: The time limit option doesn't work with the '", opts.action[0],
       "' action.",
       sep='', file=sys.stderr)
+  if opts.top_k != 1 and opts.action[0] != 'match':
+    print(
+      "Warning: The top-k option doesn't work with the '", opts.action[0],
+      "' action.",
+      sep='', file=sys.stderr)
 
   dispatcher = (
       __single_collectorset_description_action
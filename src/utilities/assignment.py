@@ -0,0 +1,290 @@
+import heapq, itertools
+from math import fsum
+from operator import itemgetter
+from . import infinity, rdict
+from .timelimit import Timelimit
+
+
+
+class SearchStatistics(object):
+  """Counters and bounds of an assignment search"""
+
+  def __init__(self):
+    super().__init__()
+    self.expanded = 0
+    self.pruned = 0
+    self.norm = infinity
+    self.lower_bound = 0
+    self.interrupted = False
+
+
+  @property
+  def gap(self):
+    """The proven distance between the found and the optimal norm"""
+    return 0 if self.norm == self.lower_bound else self.norm - self.lower_bound
+
+
+  def as_str(self, number_format=''):
+    return (
+      '{0.expanded} nodes expanded, {0.pruned} pruned, '
+      'norm = {1:{3}}, lower bound = {2:{3}}, gap = {4:{3}}{5}'.format(
+        self, self.norm, self.lower_bound, number_format, self.gap,
+        ' (interrupted)' if self.interrupted else ''))
+
+
+  def __str__(self): return self.as_str()
+
+
+
+def solve(distance_matrix, statistics=None):
+  """
+  Solves the rectangular linear assignment problem with the shortest
+  augmenting path method of Jonker and Volgenant (in the formulation of
+  Crouse, 2016) in O(n² · m) time.
+
+  Every column is assigned to a distinct row, so that the sum of the assigned
+  distances is minimal. There must be at least as many rows as columns.
+  'None' entries denote forbidden pairs.
+
+  :param distance_matrix: list[list[float | None]]
+  :param statistics: SearchStatistics
+  :return: (float, tuple[int]) the minimal distance sum and the row index for
+    every column or (infinity, None) if there is no feasible assignment
+  """
+  if statistics is None:
+    statistics = SearchStatistics()
+  if not distance_matrix or not distance_matrix[0]:
+    statistics.norm = 0
+    return 0, ()
+  row_count = len(distance_matrix)
+  column_count = len(distance_matrix[0])
+  assert row_count >= column_count
+
+  # Work on the transposed matrix, so that each column "worker" is augmented
+  # to one of the row "jobs".
+  costs = [
+    [infinity if d is None else d for d in column]
+    for column in zip(*distance_matrix)]
+  u = [0.0] * column_count
+  v = [0.0] * row_count
+  path = [-1] * row_count
+  worker4job = [-1] * row_count
+  job4worker = [-1] * column_count
+
+  for current_worker in range(column_count):
+    augmentation = _shortest_augmenting_path(
+      costs, u, v, path, worker4job, current_worker)
+    if augmentation is None:
+      statistics.lower_bound = infinity
+      return infinity, None
+    sink, min_value, visited_workers, visited_jobs, shortest_path_costs = \
+      augmentation
+    statistics.expanded += len(visited_workers)
+
+    # update dual variables
+    u[current_worker] += min_value
+    for worker in visited_workers:
+      if worker != current_worker:
+        u[worker] += min_value - shortest_path_costs[job4worker[worker]]
+    for job in visited_jobs:
+      v[job] -= min_value - shortest_path_costs[job]
+
+    # augment the previous solution
+    job = sink
+    while True:
+      worker = path[job]
+      worker4job[job] = worker
+      job4worker[worker], job = job, job4worker[worker]
+      if worker == current_worker:
+        break
+
+  statistics.norm = statistics.lower_bound = \
+    fsum(distance_matrix[i][j] for j, i in enumerate(job4worker))
+  return statistics.norm, tuple(job4worker)
+
+
+def ranked(distance_matrix):
+  """
+  Enumerates the assignments of 'distance_matrix' in the order of ascending
+  distance sums with Murty's algorithm, i. e. by partitioning the remaining
+  solution space of each yielded assignment into subproblems with forced and
+  forbidden pairs that are solved with 'solve'. Stops on a Timelimit
+  interrupt.
+
+  :param distance_matrix: list[list[float | None]]
+  :return: iterable[(float, tuple[int])]
+  """
+  norm, mapping = solve(distance_matrix)
+  if mapping is None:
+    return
+  tiebreaker = itertools.count()
+  queue = [(norm, next(tiebreaker), mapping, {}, frozenset())]
+
+  while queue and not Timelimit.interrupted_flag:
+    norm, _, mapping, forced, forbidden = heapq.heappop(queue)
+    yield norm, mapping
+
+    forced = forced.copy()
+    for j, i in enumerate(mapping):
+      if j in forced:
+        continue
+      subproblem_forbidden = forbidden | {(i, j)}
+      norm, submapping = solve(
+        _constrain(distance_matrix, forced, subproblem_forbidden))
+      if submapping is not None:
+        heapq.heappush(queue, (norm, next(tiebreaker), submapping,
+          forced.copy(), subproblem_forbidden))
+      forced[j] = i
+
+
+def _constrain(distance_matrix, forced, forbidden):
+  """
+  :param distance_matrix: list[list[float | None]]
+  :param forced: dict[int, int] maps columns to the only allowed row
+  :param forbidden: set[(int, int)] forbidden (row, column) pairs
+  :return: list[list[float | None]]
+  """
+  forced_rows = rdict(forced)
+
+  def is_allowed(i, j):
+    return (
+      (i, j) not in forbidden and
+      forced.get(j, i) == i and forced_rows.get(i, j) == j)
+
+  return [
+    [d if d is not None and is_allowed(i, j) else None
+      for j, d in enumerate(row)]
+    for i, row in enumerate(distance_matrix)]
+
+
+def _shortest_augmenting_path(costs, u, v, path, worker4job, worker):
+  """
+  Finds the shortest augmenting path from an unassigned worker to an
+  unassigned job with a Dijkstra-like search over the reduced costs.
+
+  :return: (int, float, list[int], list[int], list[float]) | None
+  """
+  job_count = len(v)
+  remaining = list(range(job_count - 1, -1, -1))
+  remaining_count = job_count
+  shortest_path_costs = [infinity] * job_count
+  visited_workers = []
+  visited_jobs = []
+  min_value = 0.0
+
+  while True:
+    visited_workers.append(worker)
+    worker_costs = costs[worker]
+    offset = min_value - u[worker]
+    lowest = infinity
+    lowest_index = -1
+
+    for index in range(remaining_count):
+      job = remaining[index]
+      reduced = offset + worker_costs[job] - v[job]
+      shortest = shortest_path_costs[job]
+      if reduced < shortest:
+        path[job] = worker
+        shortest_path_costs[job] = shortest = reduced
+      if shortest < lowest or (shortest == lowest and worker4job[job] < 0):
+        lowest = shortest
+        lowest_index = index
+
+    if lowest == infinity:
+      return None
+    min_value = lowest
+    job = remaining[lowest_index]
+    visited_jobs.append(job)
+    remaining_count -= 1
+    remaining[lowest_index] = remaining[remaining_count]
+
+    if worker4job[job] < 0:
+      return job, min_value, visited_workers, visited_jobs, shortest_path_costs
+    worker = worker4job[job]
+
+
+
+def branch_and_bound(distance_matrix, statistics=None):
+  """
+  Searches all injective mappings of columns to rows depth-first, but expands
+  the most promising branches first and prunes those whose admissible lower
+  bound can't beat the best mapping found so far (the incumbent).
+
+  The lower bound of a partial mapping up to row i is its distance sum plus
+  the sum of the column minima over the rows from i on of every unmapped
+  column.
+
+  The search stops early on a Timelimit interrupt and returns the incumbent;
+  'statistics' then holds a proven lower bound of the optimal norm.
+
+  :param distance_matrix: list[list[float | None]]
+  :param statistics: SearchStatistics
+  :return: (float, tuple[int])
+  """
+  if statistics is None:
+    statistics = SearchStatistics()
+  if not distance_matrix or not distance_matrix[0]:
+    statistics.norm = 0
+    return 0, ()
+  row_count = len(distance_matrix)
+  column_count = len(distance_matrix[0])
+  assert row_count >= column_count
+
+  distances = [
+    [infinity if d is None else d for d in row] for row in distance_matrix]
+  # column minima over all rows from i on
+  suffix_minima = [None] * row_count + [[infinity] * column_count]
+  for i in range(row_count - 1, -1, -1):
+    suffix_minima[i] = list(map(min, distances[i], suffix_minima[i + 1]))
+
+  known_mappings = [None] * column_count
+  unmapped = set(range(column_count))
+  incumbent = [infinity, None]
+
+  def lower_bound(i, excluded=None):
+    minima = suffix_minima[i]
+    return fsum(minima[j] for j in unmapped if j != excluded)
+
+  def expand(i, skippable_count, path_norm):
+    """Returns a lower bound of the unexplored part of this subtree."""
+    statistics.expanded += 1
+    if not unmapped:
+      if path_norm < incumbent[0]:
+        incumbent[:] = path_norm, tuple(known_mappings)
+      return infinity
+
+    row = distances[i]
+    branches = [
+      (path_norm + row[j] + lower_bound(i + 1, j), j)
+      for j in unmapped if row[j] != infinity]
+    if skippable_count > 0:
+      branches.append((path_norm + lower_bound(i + 1), None))
+    branches.sort(key=itemgetter(0))
+
+    for branch_idx, (bound, j) in enumerate(branches):
+      if Timelimit.interrupted_flag:
+        return bound
+      if not bound < incumbent[0]:
+        statistics.pruned += len(branches) - branch_idx
+        break
+
+      if j is None:
+        unexplored = expand(i + 1, skippable_count - 1, path_norm)
+      else:
+        known_mappings[j] = i
+        unmapped.remove(j)
+        unexplored = expand(i + 1, skippable_count, path_norm + row[j])
+        unmapped.add(j)
+        known_mappings[j] = None
+
+      if Timelimit.interrupted_flag:
+        if branch_idx + 1 < len(branches):
+          unexplored = min(unexplored, branches[branch_idx + 1][0])
+        return unexplored
+    return infinity
+
+  unexplored = expand(0, row_count - column_count, 0)
+  statistics.interrupted = bool(Timelimit.interrupted_flag)
+  statistics.norm = incumbent[0]
+  statistics.lower_bound = min(incumbent[0], unexplored)
+  return tuple(incumbent)
@@ -1,9 +1,16 @@
 import numbers, array, itertools, operator, math
-from collections import defaultdict
+from collections import defaultdict, Counter
 from math import fsum
-from utilities import minmax2
+from utilities import minmax2, infinity
+from utilities.moments import Moments
+from utilities import numeric
 from utilities.string import join, format_char
 
+try:
+  from collections.abc import Mapping
+except ImportError:
+  from collections import Mapping
+
 
 
 default_number_format = '.3g'
@@ -31,9 +38,28 @@ class DistributionTable(object):
 
 
 
+class Vocabulary(dict):
+  """
+  Assigns consecutive integers to events, e. g. to all events of the sparse
+  distribution tables of a run, so the tables can be compared as vectors
+  aligned by these indices (see 'SparseDistributionTable.index').
+  """
+
+  def index(self, event):
+    """
+    :return: int the index of 'event', that is added if it is new
+    """
+    return self.setdefault(event, len(self))
+
+
+
 class SparseDistributionTable(DistributionTable, defaultdict):
   """"Holds a probability distribution and can compute the distance to other dists"""
 
+  # the vocabulary and the sorted indices and the values of the events of
+  # this table, if it was indexed
+  __indexed = None
+
   def __init__(self, type=int, *args):
     """
     :param type: type
@@ -46,10 +72,36 @@ class SparseDistributionTable(DistributionTable, defaultdict):
 
 
   def distance_to(self, other):
-    return fsum((abs(p - other[bin]) for bin, p in self.items())) + \
+    indexed = self.__indexed
+    other_indexed = other.__indexed
+    if (indexed is not None and other_indexed is not None and
+      indexed[0] is other_indexed[0]
+    ):
+      return numeric.sparse_abs_difference_sum(*(indexed[1:] + other_indexed[1:]))
+    return fsum((abs(p - other.get(bin, 0)) for bin, p in self.items())) + \
       fsum(p for bin, p in other.items() if bin not in self)
 
 
+  def index(self, vocabulary):
+    """
+    Adds the events of this table to a vocabulary and keeps its values as a
+    vector sorted by their indices, so the distance to another table
+    indexed with the same vocabulary is computed without looking up its
+    events. The table must not change until it is indexed again or with
+    'None', which drops the vector.
+
+    :param vocabulary: Vocabulary | None
+    """
+    if vocabulary is None:
+      self.__indexed = None
+      return
+    index = vocabulary.index
+    entries = sorted((index(event), value) for event, value in self.items())
+    self.__indexed = (vocabulary,
+      array.array('q', map(operator.itemgetter(0), entries)),
+      array.array('d', map(operator.itemgetter(1), entries)))
+
+
   def count(self):
     return sum(self.values())
 
@@ -77,6 +129,148 @@ class SparseDistributionTable(DistributionTable, defaultdict):
 
 
 
+class LetterDistributionTable(DistributionTable, Mapping):
+  """
+  Holds the frequencies of characters in an array indexed by code point for
+  the 256 code points of Latin-1, including ASCII, and in a dict for all
+  others, so the characters of most text are counted in bulk and distances
+  are computed with array arithmetic.
+
+  Characters, that didn't occur, aren't keys of the mapping.
+  """
+
+  dense_size = 256
+
+
+  def __init__(self, datatype='q', dense=None, sparse=None):
+    """
+    :param datatype: str the array type code of the frequencies
+    :param dense: array.array the frequencies of the first 'dense_size'
+      code points
+    :param sparse: dict[str, int | float] the frequencies of all other
+      characters
+    """
+    super().__init__()
+    if dense is None:
+      dense = array.array(datatype, itertools.repeat(0, self.dense_size))
+    assert len(dense) == self.dense_size
+    self.dense = dense
+    self.sparse = dict() if sparse is None else sparse
+    # one past the highest code point with a frequency in 'dense'
+    self.__end = max(
+      (code + 1 for code, frequency in enumerate(dense) if frequency),
+      default=0)
+
+
+  def __getitem__(self, char):
+    code = ord(char)
+    frequency = (
+      self.dense[code] if code < self.dense_size else self.sparse.get(char, 0))
+    if not frequency:
+      raise KeyError(char)
+    return frequency
+
+
+  def __iter__(self):
+    return itertools.chain(
+      (chr(code)
+        for code, frequency in enumerate(self.dense[:self.__end])
+        if frequency),
+      self.sparse)
+
+
+  def __len__(self):
+    return (
+      self.__end - self.dense[:self.__end].count(0) + len(self.sparse))
+
+
+  def values(self):
+    """
+    :return: list[int | float] the non-zero frequencies in the order of the
+      keys
+    """
+    return list(itertools.chain(
+      filter(None, self.dense[:self.__end]), self.sparse.values()))
+
+
+  def increase(self, char, value=1):
+    code = ord(char)
+    if code < self.dense_size:
+      self.dense[code] += value
+      if code >= self.__end:
+        self.__end = code + 1
+    else:
+      self.sparse[char] = self.sparse.get(char, 0) + value
+
+
+  def increase_all(self, items):
+    """
+    Counts the characters of a sequence of strings. Latin-1 text is counted
+    as bytes in bulk.
+
+    :param items: sequence[str]
+    """
+    text = ''.join(items)
+    try:
+      data = text.encode('latin-1')
+    except UnicodeEncodeError:
+      increase = self.increase
+      for char, count in Counter(text).items():
+        increase(char, count)
+      return
+
+    dense = self.dense
+    for code, count in enumerate(numeric.byte_counts(data)):
+      if count:
+        dense[code] += count
+        end = code + 1
+    if data and end > self.__end:
+      self.__end = end
+
+
+  def count(self):
+    return sum(self.dense[:self.__end]) + sum(self.sparse.values())
+
+
+  def __truediv__(self, divisor):
+    """
+    :param divisor: numbers.Real
+    :return: LetterDistributionTable
+    """
+    divisor = float(divisor)
+    return LetterDistributionTable('d',
+      array.array('d', map(divisor.__rtruediv__, self.dense)),
+      {k: v / divisor for k, v in self.sparse.items()})
+
+
+  def distance_to(self, other):
+    """
+    :param other: LetterDistributionTable
+    :return: float the exactly rounded sum of the absolute differences of
+      all frequencies
+    """
+    end = max(self.__end, other.__end)
+    a = self.dense[:end]
+    b = other.dense[:end]
+    if not self.sparse and not other.sparse:
+      return numeric.abs_difference_sum(a, b)
+
+    other_sparse = other.sparse
+    return fsum(itertools.chain(
+      map(abs, map(operator.sub, a, b)),
+      (abs(p - other_sparse.get(char, 0)) for char, p in self.sparse.items()),
+      (p for char, p in other_sparse.items() if char not in self.sparse)))
+
+
+  def __format__(self, number_format_spec=''):
+    return join('(',
+      ', '.join((
+        '{}: {:{}}'.format(format_char(event), frequency, number_format_spec)
+        for event, frequency in self.items())),
+      ')')
+
+
+
 class UniformBinDistributionTable(DistributionTable):
 
   def __init__(self, start, stop, bincount=None, datatype=None, initializer=None):
@@ -159,6 +353,20 @@ class UniformBinDistributionTable(DistributionTable):
     self.data[self.getbinidx(key)] += value
 
 
+  def increase_all(self, keys, values):
+    """
+    :param keys: sequence[float]
+    :param values: sequence[int | float] the amount to increase the bin of
+      each key by
+    """
+    sums = numeric.bin_counts(
+      self.lower, self.__invstep, len(self.data), keys, values)
+    data = self.data
+    for binidx, value in enumerate(sums):
+      if value:
+        data[binidx] += value
+
+
   def __len__(self):
     return len(self.data)
 
@@ -188,7 +396,7 @@ class UniformBinDistributionTable(DistributionTable):
         return self.__distance_to2(other)
 
     assert not hasattr(other, '__len__') or len(self.data) == len(other)
-    return fsum(map(abs, map(operator.sub, self.data, other)))
+    return numeric.abs_difference_sum(self.data, other)
 
 
   def __distance_to2(self, other):
@@ -197,8 +405,14 @@ class UniformBinDistributionTable(DistributionTable):
         *minmax2(self, other, 'lower')) +
       UniformBinDistributionTable.__distance_to2_upper(
         *minmax2(self, other, 'upper', True)) +
-      fsum(UniformBinDistributionTable.__distance_to2_middle_parts(
-        *minmax2(self, other, 'step'))))
+      UniformBinDistributionTable.__distance_to2_middle(
+        *minmax2(self, other, 'step')))
+
+
+  def __distance_to2_middle(self, other):
+    if numeric.numpy is not None:
+      return numeric.overlap_distance(self, other)
+    return fsum(self.__distance_to2_middle_parts(other))
 
 
   def __distance_to2_middle_parts(self, other):
@@ -291,6 +505,252 @@ class UniformBinDistributionTable(DistributionTable):
 
 
 
+class StreamingHistogram(DistributionTable):
+  """
+  Counts a stream of numbers in at most 'max_bins' buckets, so it needs no
+  prior knowledge of the value range. As long as there are at most
+  'max_bins' distinct values, each of them has a bucket of its own and the
+  histogram is exact.
+
+  Beyond that, the values are counted in the buckets between consecutive
+  numbers with 'precision' significant bits. The precision starts at that of
+  floats and is lowered bit by bit until the buckets fit, or until one
+  bucket per binary order of magnitude is left. The bucket of a value
+  depends only on the value and the precision, and the precision depends
+  only on the set of distinct values. The histogram is therefore the same
+  for any order or batching of the stream, and histograms of separate
+  chunks merge to the one of the whole stream.
+  """
+
+  # the number of significant bits of floats less the implicit leading one
+  initial_precision = 52
+
+
+  def __init__(self, max_bins=1 << 16):
+    super().__init__()
+    assert max_bins >= 1
+    self.max_bins = max_bins
+    # the number of significant bits of the bucket limits; None while every
+    # distinct value has a bucket of its own
+    self.precision = None
+    self.counts = dict()
+    self.min = infinity
+    self.max = -infinity
+    self.__count = 0
+
+
+  def increase(self, item, value=1):
+    self.__add(((item, value),))
+
+
+  def increase_all(self, items):
+    """
+    :param items: numpy.ndarray | list[int | float]
+    """
+    self.__add(numeric.value_counts(items))
+
+
+  def __add(self, value_counts):
+    counts = self.counts
+    precision = self.precision
+    for value, count in value_counts:
+      if value < self.min:
+        self.min = value
+      if value > self.max:
+        self.max = value
+      self.__count += count
+      key = value if precision is None else _bucket_key(value, precision)
+      counts[key] = counts.get(key, 0) + count
+      if len(counts) > self.max_bins:
+        self.__coarsen()
+        counts = self.counts
+        precision = self.precision
+
+
+  def merge(self, other):
+    """
+    Adds the data of another histogram to this one.
+
+    :param other: StreamingHistogram
+    :return: self
+    """
+    other_counts = other.counts
+    if other.precision is not None and (
+      self.precision is None or other.precision < self.precision
+    ):
+      self.__set_precision(other.precision)
+    elif other.precision != self.precision:
+      other_counts = _rekey(other_counts, other.precision, self.precision)
+    counts = self.counts
+    for key, count in other_counts.items():
+      counts[key] = counts.get(key, 0) + count
+    self.min = min(self.min, other.min)
+    self.max = max(self.max, other.max)
+    self.__count += other.__count
+    if len(counts) > self.max_bins:
+      self.__coarsen()
+    return self
+
+
+  def __coarsen(self):
+    precision = \
+      self.initial_precision + 1 if self.precision is None else self.precision
+    while len(self.counts) > self.max_bins and precision > 1:
+      precision -= 1
+      self.__set_precision(precision)
+
+
+  def __set_precision(self, precision):
+    self.counts = _rekey(self.counts, self.precision, precision)
+    self.precision = precision
+
+
+  def buckets(self):
+    """
+    :return: list[(float, float, int)] the lower and upper limits of the
+      buckets within the minimum and the maximum value and their counts in
+      ascending order; the limits of the bucket of a single value are equal
+    """
+    precision = self.precision
+    if precision is None:
+      return [(value, value, count)
+        for value, count in sorted(self.counts.items())]
+
+    lower_limit = self.min
+    upper_limit = self.max
+    buckets = []
+    for (mantissa, exponent), count in self.counts.items():
+      if mantissa:
+        lower = math.ldexp(mantissa, exponent - precision)
+        upper = math.ldexp(mantissa + 1, exponent - precision)
+        lower = max(lower, lower_limit)
+        upper = min(upper, upper_limit)
+      else:
+        lower = upper = 0
+      buckets.append((lower, upper, count))
+    buckets.sort()
+    return buckets
+
+
+  def count(self):
+    return self.__count
+
+
+  @property
+  def moments(self):
+    """
+    :return: Moments the count, mean and variance of the values, with the
+      centres of buckets, that span several values, in their place
+    """
+    return self.__moments(self.buckets())
+
+
+  def __moments(self, buckets):
+    moments = Moments()
+    moments.count = self.__count
+    if moments.count:
+      moments.mean = fsum(
+        (lower + upper) / 2 * count for lower, upper, count in buckets
+      ) / moments.count
+      moments.m2 = fsum(
+        ((lower + upper) / 2 - moments.mean) ** 2 * count
+        for lower, upper, count in buckets)
+    return moments
+
+
+  def __truediv__(self, divisor):
+    return self.as_uniform_table() / divisor
+
+
+  def distance_to(self, other):
+    if isinstance(other, StreamingHistogram):
+      other = other.as_uniform_table()
+    return self.as_uniform_table().distance_to(other)
+
+
+  def as_uniform_table(self, count=None, datatype='I'):
+    """
+    Resamples the buckets to a uniform bin distribution table between the
+    minimum and the maximum value with the same bin count as
+    'UniformBinDistributionTable.for_variance' chooses for the exact data.
+    The count of a single value falls into the bin of that value; that of a
+    bucket, that spans several values, is spread over the bins it overlaps
+    in proportion to the overlap, like in the 'sum' procedure of Ben-Haim's
+    and Tom-Tov's streaming histograms. The table has the datatype 'd' then.
+
+    :param count: int the item count to choose the bin count for; defaults
+      to the number of collected values
+    :param datatype: str
+    :return: UniformBinDistributionTable
+    """
+    buckets = self.buckets()
+    table = UniformBinDistributionTable.for_variance(
+      self.__count if count is None else count,
+      self.min, self.max, self.__moments(buckets).variance,
+      datatype if self.precision is None else 'd')
+    points = [(lower, count) for lower, upper, count in buckets if lower == upper]
+    if points:
+      table.increase_all(*zip(*points))
+
+    spread = [0.0] * len(table)
+    for lower, upper, count in buckets:
+      if lower != upper:
+        first = table.getbinidx(lower)
+        last = table.getbinidx(upper)
+        density = count / (upper - lower)
+        for binidx in range(first, last + 1):
+          overlap = (
+            (upper if binidx == last else table.getbinupper(binidx)) -
+            (lower if binidx == first else table.getbinlower(binidx)))
+          spread[binidx] += overlap * density
+    if self.precision is not None:
+      data = table.data
+      for binidx, value in enumerate(spread):
+        data[binidx] += value
+    return table
+
+
+  def __format__(self, number_format_spec=''):
+    return join('{',
+      ', '.join((
+        ('{1:{0}}: {3}' if lower == upper else '[{1:{0}}, {2:{0}}): {3}')
+          .format(number_format_spec, lower, upper, count)
+        for lower, upper, count in self.buckets())),
+      '}')
+
+
+
+def _bucket_key(value, precision):
+  """
+  :return: (int, int) the mantissa of the largest number with 'precision'
+    significant bits, that doesn't exceed 'value', as an integer, and its
+    exponent
+  """
+  mantissa, exponent = math.frexp(value)
+  return math.floor(math.ldexp(mantissa, precision)), exponent
+
+
+def _rekey(counts, precision, new_precision):
+  """
+  Sums the counts of buckets of one precision, or of single values if it is
+  None, in the buckets of a lower precision.
+
+  :return: dict
+  """
+  if precision is None:
+    key = lambda value: _bucket_key(value, new_precision)
+  else:
+    shift = precision - new_precision
+    assert shift >= 0
+    key = lambda bucket: (bucket[0] >> shift, bucket[1])
+  result = dict()
+  for old_key, count in counts.items():
+    new_key = key(old_key)
+    result[new_key] = result.get(new_key, 0) + count
+  return result
+
+
+
 def _sturges_rule(n):
   assert isinstance(n, numbers.Integral) and n > 0
   return (n - 1).bit_length() + 1
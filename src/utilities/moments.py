@@ -0,0 +1,153 @@
+from math import sqrt
+from utilities import NaN
+
+
+
+class Moments(object):
+  """
+  Accumulates the count, mean, and sum of squared deviations from the mean of
+  a sequence of numbers in a single pass with Welford's method. Accumulators
+  of separate chunks of a sequence can be merged (Chan et al., 1979).
+  """
+
+  def __init__(self):
+    super().__init__()
+    self.count = 0
+    self.mean = 0.0
+    self.m2 = 0.0
+
+
+  def add(self, x, weight=1):
+    self.count += weight
+    delta = x - self.mean
+    self.mean += delta * weight / self.count
+    self.m2 += delta * (x - self.mean) * weight
+
+
+  def update(self, iterable):
+    add = self.add
+    for x in iterable:
+      add(x)
+    return self
+
+
+  def merge(self, other):
+    """
+    Adds the accumulated data of 'other' to this accumulator.
+
+    :param other: Moments
+    :return: self
+    """
+    if other.count:
+      if not self.count:
+        self.__dict__.update(other.__dict__)
+      else:
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+    return self
+
+
+  __iadd__ = merge
+
+
+  @property
+  def variance(self):
+    """The population variance"""
+    return self.m2 / self.count if self.count else NaN
+
+
+  @property
+  def standard_deviation(self):
+    return sqrt(self.variance)
+
+
+  @property
+  def variation_coefficient(self):
+    return self.standard_deviation / self.mean
+
+
+  def __format__(self, format_spec=''):
+    return 'n = {0}, mean = {1:{3}}, variance = {2:{3}}'.format(
+      self.count, self.mean, self.variance, format_spec)
+
+
+  def __str__(self): return self.__format__()
+
+
+
+class HigherMoments(Moments):
+  """
+  Accumulates the third and fourth central moments in addition to those of
+  Moments with the update formulae of Pébay (2008).
+  """
+
+  def __init__(self):
+    super().__init__()
+    self.m3 = 0.0
+    self.m4 = 0.0
+
+
+  def add(self, x, weight=1):
+    if weight != 1:
+      point = HigherMoments()
+      point.count = weight
+      point.mean = x
+      self.merge(point)
+      return
+
+    n1 = self.count
+    self.count = n = n1 + 1
+    delta = x - self.mean
+    delta_n = delta / n
+    delta_n2 = delta_n * delta_n
+    term1 = delta * delta_n * n1
+    self.mean += delta_n
+    self.m4 += (term1 * delta_n2 * (n * n - 3 * n + 3) +
+      6 * delta_n2 * self.m2 - 4 * delta_n * self.m3)
+    self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+    self.m2 += term1
+
+
+  def merge(self, other):
+    """
+    :param other: HigherMoments
+    :return: self
+    """
+    if other.count:
+      if not self.count:
+        self.__dict__.update(other.__dict__)
+      else:
+        na = self.count
+        nb = other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        self.m4 += (other.m4 +
+          delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / (n * n * n) +
+          6 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / (n * n) +
+          4 * delta * (na * other.m3 - nb * self.m3) / n)
+        self.m3 += (other.m3 +
+          delta2 * delta * na * nb * (na - nb) / (n * n) +
+          3 * delta * (na * other.m2 - nb * self.m2) / n)
+        self.m2 += other.m2 + delta2 * na * nb / n
+        self.mean += delta * nb / n
+        self.count = n
+    return self
+
+
+  __iadd__ = merge
+
+
+  @property
+  def skewness(self):
+    """The population skewness"""
+    return sqrt(self.count) * self.m3 / self.m2 ** 1.5 if self.m2 else NaN
+
+
+  @property
+  def kurtosis(self):
+    """The population excess kurtosis"""
+    return self.count * self.m4 / (self.m2 * self.m2) - 3 if self.m2 else NaN
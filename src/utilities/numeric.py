@@ -0,0 +1,343 @@
+"""
+Bulk operations on numeric data, that use NumPy if it is importable and fall
+back to pure Python otherwise. Both backends give the same results up to
+floating-point rounding.
+"""
+
+import operator, collections
+from array import array
+from math import fsum
+from .moments import HigherMoments
+
+try:
+  from collections.abc import Sequence
+except ImportError:
+  from collections import Sequence
+
+try:
+  import numpy
+except ImportError:
+  numpy = None
+
+
+
+class TypedColumn(Sequence):
+  """
+  Stores numbers compactly in an 'array.array' with a validity mask instead
+  of a list of boxed numbers. Invalid items, e. g. unparseable cells, read
+  as None.
+  """
+
+  def __init__(self, values, mask=None):
+    """
+    :param values: array.array
+    :param mask: bytearray | None non-zero for every valid item; None if all
+      items are valid
+    """
+    super().__init__()
+    assert mask is None or len(mask) == len(values)
+    self.values = values
+    self.mask = mask
+
+
+  @staticmethod
+  def from_items(typecode, items):
+    """
+    :param typecode: str an 'array.array' type code
+    :param items: sequence[int | float | None]
+    :return: TypedColumn | None None if some item doesn't fit the type
+    """
+    try:
+      if None not in items:
+        return TypedColumn(array(typecode, items))
+      return TypedColumn(
+        array(typecode, [0 if item is None else item for item in items]),
+        bytearray(item is not None for item in items))
+    except (OverflowError, TypeError):
+      return None
+
+
+  def __len__(self):
+    return len(self.values)
+
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      return TypedColumn(self.values[index],
+        None if self.mask is None else self.mask[index])
+    if self.mask is None or self.mask[index]:
+      return self.values[index]
+    return None
+
+
+  def count(self, item):
+    if item is None:
+      return 0 if self.mask is None else self.mask.count(0)
+    return super().count(item)
+
+
+  def copy(self):
+    return self[:]
+
+
+  def valid_values(self):
+    """
+    :return: numpy.ndarray | list[int | float] the valid items, that aren't
+      NaN, without copying if possible
+    """
+    if numpy is not None and len(self.values):
+      values = numpy.frombuffer(self.values, self.values.typecode)
+      if self.mask is not None:
+        values = values[numpy.frombuffer(self.mask, bool)]
+      if values.dtype.kind == 'f':
+        values = values[~numpy.isnan(values)]
+      return values
+
+    values = self.values
+    if self.mask is not None:
+      values = [value for value, valid in zip(values, self.mask) if valid]
+    if values and self.values.typecode in 'fd':
+      return [value for value in values if value == value]
+    return values if isinstance(values, list) else values.tolist()
+
+
+
+def numeric_items(items):
+  """
+  Returns the numeric items, that aren't NaN, and the number of non-numeric
+  items, e. g. None.
+
+  :param items: sequence | TypedColumn
+  :return: (numpy.ndarray | list[int | float], int)
+  """
+  if isinstance(items, TypedColumn):
+    return items.valid_values(), items.count(None)
+
+  values = [item for item in items if isinstance(item, (int, float))]
+  invalid_count = len(items) - len(values)
+  if numpy is not None and values:
+    array = numpy.array(values)
+    if array.dtype.kind == 'f':
+      return array[~numpy.isnan(array)], invalid_count
+    if array.dtype.kind in 'iub':
+      return array, invalid_count
+  return [item for item in values if item == item], invalid_count
+
+
+def _is_array(values):
+  return numpy is not None and isinstance(values, numpy.ndarray)
+
+
+def total(values, start=0):
+  """
+  :param values: numpy.ndarray | list[int | float]
+  :param start: int | float
+  :return: int | float
+  """
+  if _is_array(values) and values.dtype.kind == 'f':
+    return start + values.sum().item()
+  return sum(values.tolist() if _is_array(values) else values, start)
+
+
+def minimum(values, default):
+  if not len(values):
+    return default
+  return values.min().item() if _is_array(values) else min(values)
+
+
+def maximum(values, default):
+  if not len(values):
+    return default
+  return values.max().item() if _is_array(values) else max(values)
+
+
+def add_moments(moments, values):
+  """
+  Adds values to a Moments or HigherMoments accumulator. Arrays are
+  accumulated in a separate vectorised pass and then merged.
+
+  :param moments: Moments
+  :param values: numpy.ndarray | list[int | float]
+  :return: Moments 'moments'
+  """
+  if not _is_array(values):
+    return moments.update(values)
+  if not len(values):
+    return moments
+
+  chunk = type(moments)()
+  values = values.astype(float)
+  chunk.count = len(values)
+  chunk.mean = values.mean().item()
+  deviations = values - chunk.mean
+  squares = deviations * deviations
+  chunk.m2 = squares.sum().item()
+  if isinstance(chunk, HigherMoments):
+    chunk.m3 = numpy.dot(squares, deviations).item()
+    chunk.m4 = numpy.dot(squares, squares).item()
+  return moments.merge(chunk)
+
+
+def value_counts(values):
+  """
+  :param values: numpy.ndarray | list[int | float]
+  :return: iterable[(int | float, int)] the distinct values and their counts
+    in ascending order
+  """
+  if _is_array(values):
+    distinct, counts = numpy.unique(values, return_counts=True)
+    return zip(distinct.tolist(), counts.tolist())
+
+  counts = dict()
+  for value in values:
+    counts[value] = counts.get(value, 0) + 1
+  return sorted(counts.items())
+
+
+def bin_counts(lower, invstep, bincount, keys, weights):
+  """
+  Sums the weights of the keys in each of 'bincount' uniform bins starting at
+  'lower'. Keys outside the bins count to the first or the last bin.
+
+  :return: list[int | float]
+  """
+  if numpy is None:
+    result = [0] * bincount
+    last = bincount - 1
+    for key, weight in zip(keys, weights):
+      result[
+        0 if key <= lower else
+        min(int((key - lower) * invstep), last)] += weight
+    return result
+
+  keys = numpy.asarray(keys, dtype=float)
+  indices = numpy.clip(
+    ((keys - lower) * invstep).astype(int), 0, bincount - 1)
+  indices[keys <= lower] = 0
+  weights = numpy.asarray(weights)
+  sums = numpy.bincount(indices, weights, bincount)
+  if weights.dtype.kind in 'iub':
+    sums = sums.round().astype(int)
+  return sums.tolist()
+
+
+def byte_counts(data):
+  """
+  :param data: bytes
+  :return: list[int] the number of occurrences of every byte value
+  """
+  if numpy is None:
+    result = [0] * 256
+    for byte, count in collections.Counter(data).items():
+      result[byte] = count
+    return result
+
+  return numpy.bincount(
+    numpy.frombuffer(data, numpy.uint8), minlength=256).tolist()
+
+
+def abs_difference_sum(a, b):
+  """
+  :param a: sequence[float]
+  :param b: sequence[float]
+  :return: float the exactly rounded sum of the absolute differences
+  """
+  if numpy is None:
+    return fsum(map(abs, map(operator.sub, a, b)))
+  return fsum(numpy.abs(
+    numpy.asarray(a, dtype=float) - numpy.asarray(b, dtype=float)).tolist())
+
+
+def abs_difference_matrix(a, b):
+  """
+  :param a: sequence[float]
+  :param b: sequence[float]
+  :return: list[list[float]] the absolute differences of every item of 'a'
+    (inner) to every item of 'b' (outer)
+  """
+  if numpy is None:
+    return [[abs(x - y) for x in a] for y in b]
+  return numpy.abs(numpy.subtract.outer(
+    numpy.asarray(b, dtype=float), numpy.asarray(a, dtype=float))).tolist()
+
+
+def sparse_abs_difference_sum(a_indices, a_values, b_indices, b_values):
+  """
+  Sums the absolute differences of two sparse vectors of non-negative
+  values, whose entries without an index are 0, like
+  'SparseDistributionTable.distance_to' sums those of two tables: the
+  differences at the indices of 'a' and the values at the other indices of
+  'b' are summed separately.
+
+  :param a_indices: sequence[int] sorted and distinct
+  :param a_values: sequence[float]
+  :param b_indices: sequence[int] sorted and distinct
+  :param b_values: sequence[float]
+  :return: float
+  """
+  if numpy is None:
+    a_sum, b_sum = _merge_abs_differences(
+      a_indices, a_values, b_indices, b_values)
+    return fsum(a_sum) + fsum(b_sum)
+
+  a_values = numpy.asarray(a_values, dtype=float)
+  b_values = numpy.asarray(b_values, dtype=float)
+  _, a_common, b_common = numpy.intersect1d(
+    numpy.asarray(a_indices), numpy.asarray(b_indices),
+    assume_unique=True, return_indices=True)
+  a_differences = numpy.abs(a_values)
+  a_differences[a_common] = numpy.abs(a_values[a_common] - b_values[b_common])
+  b_only = numpy.ones(len(b_values), bool)
+  b_only[b_common] = False
+  return fsum(a_differences.tolist()) + fsum(b_values[b_only].tolist())
+
+
+def _merge_abs_differences(a_indices, a_values, b_indices, b_values):
+  """
+  :return: (list[float], list[float]) the absolute differences at the
+    indices of 'a' and the values at the other indices of 'b'
+  """
+  a_differences = list(map(abs, a_values))
+  b_only = []
+  i = 0
+  a_len = len(a_indices)
+  for b_index, b_value in zip(b_indices, b_values):
+    while i < a_len and a_indices[i] < b_index:
+      i += 1
+    if i < a_len and a_indices[i] == b_index:
+      a_differences[i] = abs(a_values[i] - b_value)
+    else:
+      b_only.append(b_value)
+  return a_differences, b_only
+
+
+def overlap_distance(a, b):
+  """
+  Returns the integral of the absolute difference of the densities of two
+  uniform bin distribution tables over the intersection of their ranges.
+
+  :param a: UniformBinDistributionTable
+  :param b: UniformBinDistributionTable
+  :return: float
+  """
+  a_data = numpy.asarray(a.data, dtype=float)
+  b_data = numpy.asarray(b.data, dtype=float)
+  a_edges = numpy.arange(len(a_data) + 1) * a.step + a.lower
+  b_edges = numpy.arange(len(b_data) + 1) * b.step + b.lower
+  lower = max(a.lower, b.lower)
+  upper = min(a_edges[-1], b_edges[-1])
+  if not lower < upper:
+    return 0.0
+
+  edges = numpy.union1d(
+    a_edges[(a_edges > lower) & (a_edges < upper)],
+    b_edges[(b_edges > lower) & (b_edges < upper)])
+  edges = numpy.concatenate(([lower], edges, [upper]))
+  middles = (edges[:-1] + edges[1:]) * 0.5
+  a_indices = numpy.clip(
+    ((middles - a.lower) * a.invstep).astype(int), 0, len(a_data) - 1)
+  b_indices = numpy.clip(
+    ((middles - b.lower) * b.invstep).astype(int), 0, len(b_data) - 1)
+  return fsum((numpy.abs(
+      a_data[a_indices] * a.invstep - b_data[b_indices] * b.invstep) *
+    numpy.diff(edges)).tolist())
@@ -0,0 +1,42 @@
+import builtins, multiprocessing
+from functools import partial as partialfn
+from .timelimit import Timelimit
+
+
+
+def map(function, iterable, jobs=1, *shared):
+  """
+  Returns the list of 'function(*shared, item)' for every item in 'iterable'
+  in the same order, computed by 'jobs' forked worker processes ('0' means
+  one per CPU) or serially for a single job.
+
+  The function and the shared arguments are inherited by the workers when
+  they are forked; only the items and the results are pickled. An active
+  Timelimit carries over to the workers.
+
+  :param function: callable
+  :param iterable: iterable
+  :param jobs: int
+  :return: list
+  """
+  if jobs == 1:
+    return list(builtins.map(partialfn(function, *shared), iterable))
+
+  context = multiprocessing.get_context('fork')
+  with context.Pool(jobs or None, _init_worker,
+    (function, shared, Timelimit.remaining())
+  ) as pool:
+    return pool.map(_call_worker, iterable, 1)
+
+
+_worker_function = None
+
+
+def _init_worker(function, shared, time_limit):
+  global _worker_function
+  _worker_function = partialfn(function, *shared)
+  Timelimit.inherit(time_limit)
+
+
+def _call_worker(item):
+  return _worker_function(item)
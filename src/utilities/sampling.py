@@ -0,0 +1,44 @@
+import io, random
+from itertools import chain
+
+
+
+def sample_lines(src, block_count, block_size=1 << 16, seed=0):
+  """
+  Yields the lines of the first 'block_size' bytes of a seekable binary file
+  and of up to 'block_count' more blocks of 'block_size' bytes at random
+  offsets, so the number of lines read doesn't grow with the file size.
+
+  Every block but the first starts after the next line break at its offset
+  and every block extends to the end of its last line, so only whole lines
+  are yielded, each at most once and in file order. The offsets depend only
+  on the file size, 'block_count', 'block_size', and 'seed'.
+
+  :param src: io.BufferedIOBase
+  :param block_count: int
+  :param block_size: int
+  :param seed: hashable
+  :return: iterable[bytes]
+  """
+  size = src.seek(0, io.SEEK_END)
+  if size > block_size:
+    offsets = sorted(random.Random(seed).sample(
+      range(block_size, size), min(block_count, size - block_size)))
+  else:
+    offsets = ()
+
+  src.seek(0)
+  position = 0
+  for offset in chain((0,), offsets):
+    if offset > position:
+      # a block starting right after a line break keeps that line
+      src.seek(offset - 1)
+      src.readline()
+      position = src.tell()
+    end = offset + block_size
+    while position < end:
+      line = src.readline()
+      if not line:
+        return
+      position += len(line)
+      yield line
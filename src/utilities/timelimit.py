@@ -40,6 +40,25 @@ class Timelimit(object):
     Timelimit.interrupted_flag = None
 
 
+  @staticmethod
+  def remaining():
+    """Returns the remaining seconds of the active time limit or 0."""
+    if Timelimit.interrupted_flag is None:
+      return 0
+    return signal.getitimer(signal.ITIMER_REAL)[0]
+
+
+  @staticmethod
+  def inherit(seconds):
+    """
+    Continues the remaining time limit of the parent process in a forked
+    child process, that doesn't inherit pending alarms but the signal
+    handlers and the interrupted flag.
+    """
+    if seconds > 0:
+      signal.setitimer(signal.ITIMER_REAL, seconds)
+
+
   @staticmethod
   def __timeout_handler(signum, frame):
     if signum == signal.SIGALRM:
@@ -0,0 +1,66 @@
+import unittest, os, os.path, io, tempfile, shutil, random
+import collector.description.normal.L1 as L1
+import collector.description.normal.L2 as L2
+from collector.description._argparser import parse
+from actions.compare import compare_descriptions
+
+
+
+class CompareDescriptionsTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    rng = random.Random(0x5eed)
+    self.paths = []
+    for name, order in (('a', (0, 1, 2)), ('b', (1, 0, 2))):
+      records = [
+        (''.join(rng.choice('abcde') for _ in range(rng.randrange(1, 6))),
+          str(rng.randrange(1000)), '{:.2f}'.format(rng.random() * 10))
+        for _ in range(60)]
+      path = os.path.join(self.directory, name + '.csv')
+      with open(path, 'w') as f:
+        for record in records:
+          print(*map(record.__getitem__, order), sep=';', file=f)
+      with open(os.path.join(self.directory, name + '_desc.txt'), 'w') as f:
+        for column_idx, source_idx in enumerate(order, 1):
+          print(column_idx, source_idx + 1, sep=',', file=f)
+      self.paths.append(path)
+    # schema descriptors are found by the base names of the schema instances
+    self.cwd = os.getcwd()
+    os.chdir(self.directory)
+
+
+  def tearDown(self):
+    os.chdir(self.cwd)
+    shutil.rmtree(self.directory)
+
+
+  def compare(self, descriptions, **kwargs):
+    output = io.StringIO()
+    schema_instances = [open(path) for path in self.paths]
+    try:
+      self.assertEqual(
+        compare_descriptions(schema_instances, descriptions,
+          field_delimiter=';', output=output, **kwargs),
+        0)
+    finally:
+      for src in schema_instances:
+        src.close()
+    return output.getvalue()
+
+
+  def test_shared_collection(self):
+    output = self.compare((L1, L2))
+    self.assertEqual(output, self.compare((L1, L2), cascade=True))
+    self.assertIn('errors=0', output)
+
+
+  def test_jobs(self):
+    descriptions = (L1, L2, parse(L2.__file__))
+    self.assertEqual(
+      self.compare(descriptions, jobs=2), self.compare(descriptions))
+
+
+
+if __name__ == '__main__':
+  unittest.main()
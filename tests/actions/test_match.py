@@ -0,0 +1,118 @@
+import unittest, random, os.path, tempfile, shutil, math
+import collector.description.normal.L1 as L1
+from collector.multiphase import MultiphaseCollector
+from actions.match import bounded_results_norms, get_best_schema_mapping, \
+  collect_analyse, collect_analyse_match
+
+
+
+class BoundedResultsNormsTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.collectors = []
+    for column_count in (3, 4):
+      rows = [
+        [''.join(rng.choice('abcdefg'[:column_idx + 3])
+            for _ in range(rng.randrange(1, 4 + column_idx)))
+          for column_idx in range(column_count)]
+        for _ in range(rng.randrange(40, 80))]
+      multiphasecollector = MultiphaseCollector(rows)
+      multiphasecollector.do_phases(L1.descriptions)
+      self.collectors.append(multiphasecollector)
+
+
+  def test_best_mapping(self):
+    a, b = self.collectors
+    exact = MultiphaseCollector.results_norms(a, b, L1.weights)
+    bounded = bounded_results_norms(a, b, L1.weights)
+    norm, mapping = get_best_schema_mapping(bounded)
+    self.assertEqual((norm, mapping), get_best_schema_mapping(exact))
+    for a_idx, b_idx in enumerate(mapping):
+      self.assertEqual(bounded[b_idx][a_idx], exact[b_idx][a_idx])
+    for bounded_row, exact_row in zip(bounded, exact):
+      for bound, exact_norm in zip(bounded_row, exact_row):
+        self.assertLessEqual(bound, exact_norm)
+
+
+
+class AnalyseTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    rng = random.Random(0x5eed)
+    columns = {
+      'str': lambda:
+        ''.join(rng.choice('abcde') for _ in range(rng.randrange(1, 6))),
+      'int': lambda: str(rng.randrange(1000)),
+      'float': lambda: '{:.2f}'.format(rng.gauss(5, 2)),
+    }
+    self.paths = []
+    for name, types in (('a', ('str', 'int', 'float')),
+      ('b', ('int', 'float', 'float', 'int'))
+    ):
+      path = os.path.join(self.directory, name + '.csv')
+      with open(path, 'w') as f:
+        for _ in range(80):
+          print(*(columns[column_type]() for column_type in types), sep=';',
+            file=f)
+      self.paths.append(path)
+
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+
+  def analyse(self, action, **kwargs):
+    schema_instances = [open(path) for path in self.paths]
+    try:
+      return action(schema_instances, L1, field_delimiter=';', **kwargs)
+    finally:
+      for src in schema_instances:
+        src.close()
+
+
+  def assertNormsEqual(self, actual, expected):
+    self.assertEqual(len(actual), len(expected))
+    for actual_row, expected_row in zip(actual, expected):
+      self.assertEqual(len(actual_row), len(expected_row))
+      for x, y in zip(actual_row, expected_row):
+        if not (math.isnan(x) and math.isnan(y)):
+          self.assertEqual(x, y)
+
+
+  def test_cascade_norms(self):
+    collectors, _, expected = self.analyse(collect_analyse)
+    self.assertFalse(any(
+      collector_set.ispruned()
+      for collector in collectors
+      for collector_set in collector.merged_predecessors))
+    collectors, _, actual = self.analyse(collect_analyse, cascade=True)
+    self.assertTrue(collectors[0].merged_predecessors[0].ispruned())
+    self.assertEqual(len(actual), len(expected))
+    for actual_combination, expected_combination in zip(actual, expected):
+      self.assertEqual(actual_combination[:2], expected_combination[:2])
+      self.assertNormsEqual(actual_combination[2], expected_combination[2])
+      self.assertEqual(get_best_schema_mapping(actual_combination[2]),
+        get_best_schema_mapping(expected_combination[2]))
+
+
+  def test_cascade_mappings(self):
+    self.assertEqual(
+      self.analyse(collect_analyse_match, cascade=True)[1:],
+      self.analyse(collect_analyse_match)[1:])
+
+
+  def test_jobs(self):
+    expected = self.analyse(collect_analyse_match)[1:]
+    for jobs in (2, 0, 1):
+      self.assertEqual(
+        self.analyse(collect_analyse_match, jobs=jobs)[1:], expected)
+      self.assertEqual(
+        self.analyse(collect_analyse_match, jobs=jobs, cascade=True)[1:],
+        expected)
+
+
+
+if __name__ == '__main__':
+  unittest.main()
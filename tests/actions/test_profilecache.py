@@ -0,0 +1,144 @@
+import unittest, os, os.path, tempfile, shutil, time, io, contextlib
+import collector.description.normal.L1 as description
+from actions import profilecache
+from actions.collect import collect
+from actions.profilecache import ProfileCache
+
+
+
+class ProfileCacheTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.src_path = os.path.join(self.directory, 'instance.csv')
+    with open(self.src_path, 'w') as f:
+      for i in range(100):
+        print('name{};{};{}'.format(i, i * 3, i % 7 * 0.5), file=f)
+    self.options = {
+      'no_cache': False, 'cache_dir': os.path.join(self.directory, 'cache'),
+      'field_delimiter': ';'}
+
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+
+  def collect(self, **kwargs):
+    kwargs = dict(self.options, **kwargs)
+    with open(self.src_path) as src:
+      return collect(src, description, **kwargs)
+
+
+  def results(self, multiphasecollector):
+    return [
+      [(type(c).__name__, str(c.get_result(column)))
+        for c in column.values()]
+      for column in multiphasecollector.merged_predecessors]
+
+
+  def test_round_trip(self):
+    collected = self.collect()
+    self.assertEqual(len(os.listdir(self.options['cache_dir'])), 1)
+    cached = self.collect()
+    self.assertEqual(cached.columns.rowcount, 100)
+    self.assertEqual(len(cached.columns), 0)
+    self.assertEqual(self.results(cached), self.results(collected))
+
+
+  def test_key(self):
+    cache = ProfileCache.from_options(**self.options)
+    with open(self.src_path) as src:
+      key = cache.key(src, description, **self.options)
+      self.assertEqual(key, cache.key(src, description, **self.options))
+      self.assertNotEqual(key,
+        cache.key(src, description, **dict(self.options, field_delimiter=',')))
+      self.assertNotEqual(key,
+        cache.key(src, description, **dict(self.options, sample=4)))
+      self.assertEqual(key,
+        cache.key(src, description, **dict(self.options, chunk_size=7)))
+      self.assertNotEqual(
+        cache.key(src, description, **dict(self.options, converge=0.01)),
+        cache.key(src, description,
+          **dict(self.options, converge=0.01, chunk_size=7)))
+
+    with open(self.src_path, 'a') as f:
+      print('name;0;0', file=f)
+    with open(self.src_path) as src:
+      self.assertNotEqual(key, cache.key(src, description, **self.options))
+
+
+  def test_code_fingerprint(self):
+    cache = ProfileCache.from_options(**self.options)
+    fingerprint = profilecache.code_fingerprint()
+    with open(self.src_path) as src:
+      key = cache.key(src, description, **self.options)
+      profilecache._code_fingerprint = fingerprint[::-1]
+      try:
+        self.assertNotEqual(key, cache.key(src, description, **self.options))
+      finally:
+        profilecache._code_fingerprint = None
+      self.assertEqual(profilecache.code_fingerprint(), fingerprint)
+      self.assertEqual(key, cache.key(src, description, **self.options))
+
+
+  def test_explain_plan(self):
+    self.collect()
+    stderr = io.StringIO()
+    with contextlib.redirect_stderr(stderr):
+      explained = self.collect(explain_plan=True)
+    self.assertIn('instance.csv:', stderr.getvalue())
+    self.assertEqual(explained.columns.rowcount, 100)
+    self.assertEqual(len(explained.columns), 3)
+
+
+  def test_incremental(self):
+    collected = self.collect(incremental=True)
+    with open(self.src_path, 'a') as f:
+      for i in range(100, 150):
+        print('name{};{};{}'.format(i, i * 3, i % 7 * 0.5), file=f)
+    resumed = self.collect(incremental=True)
+    self.assertEqual(resumed.columns.rowcount, 150)
+    self.assertEqual(len(resumed.columns), 0)
+    # equal up to floating-point rounding
+    rounded = lambda collector: \
+      [format(column, '.9e') for column in collector.merged_predecessors]
+    self.assertEqual(rounded(resumed), rounded(self.collect(no_cache=True)))
+    self.assertNotEqual(rounded(resumed), rounded(collected))
+
+    with open(self.src_path, 'r+') as f:
+      f.write('x')
+    self.assertEqual(len(self.collect(incremental=True).columns), 3)
+    self.assertEqual(len(self.collect(incremental=True).columns), 0)
+
+
+  def test_disabled(self):
+    self.assertIsNotNone(
+      ProfileCache.from_options(cache_dir=self.options['cache_dir']))
+    self.assertIsNone(ProfileCache.from_options())
+    self.assertIsNone(ProfileCache.from_options(
+      **dict(self.options, no_cache=True)))
+    self.collect(no_cache=True)
+    self.assertFalse(os.path.exists(self.options['cache_dir']))
+
+
+  def test_evict(self):
+    self.collect()
+    cache = ProfileCache.from_options(**self.options)
+    cache.max_age = 3600
+    path, = (
+      os.path.join(cache.directory, name)
+      for name in os.listdir(cache.directory))
+    stale = time.time() - 7200
+    os.utime(path, (stale, stale))
+    cache.evict()
+    self.assertFalse(os.path.exists(path))
+
+    self.collect()
+    cache.max_size = 0
+    cache.evict()
+    self.assertEqual(os.listdir(cache.directory), [])
+
+
+
+if __name__ == '__main__':
+  unittest.main()
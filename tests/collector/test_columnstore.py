@@ -0,0 +1,89 @@
+import unittest
+from collector.columnstore import ColumnStore
+from collector.columntype import toint, tofloat
+from utilities.numeric import TypedColumn
+from collector.multiphase import MultiphaseCollector
+from collector.rows import RowCollector
+from collector.set import ItemCollectorSet
+from collector.letterfrequency import LetterFrequencyCollector
+from collector.lettercount import ItemLetterCountCollector
+
+
+
+class ColumnStoreTestCase(unittest.TestCase):
+
+  rows = (['a', '1', 'x'], ['bc', '2'], ['d', '3', 'y', 'z'])
+
+
+  def test_transpose(self):
+    columns = ColumnStore(self.rows)
+    self.assertEqual(columns.rowcount, 3)
+    self.assertEqual(columns,
+      [['a', 'bc', 'd'], ['1', '2', '3'], ['x', '', 'y']])
+
+
+  def test_row_view(self):
+    rows = ColumnStore(self.rows).rows
+    self.assertEqual(len(rows), 3)
+    self.assertEqual(list(rows[1]), ['bc', '2', ''])
+    self.assertEqual(list(rows[-1]), ['d', '3', 'y'])
+    rows[0][1] = 1
+    self.assertEqual(rows.columns[1], [1, '2', '3'])
+
+
+  def test_row_wise_collection(self):
+    def collect(collect_rows):
+      phase = RowCollector(
+        ItemCollectorSet((LetterFrequencyCollector, ItemLetterCountCollector))
+        for _ in range(3))
+      collect_rows(phase)
+      return [
+        (dict(s[LetterFrequencyCollector].get_result()),
+          s[ItemLetterCountCollector].get_result())
+        for s in phase]
+
+    columns = ColumnStore(self.rows)
+    self.assertEqual(
+      collect(lambda phase: phase.collect_columns(columns)),
+      collect(lambda phase: phase.collect_all(columns.rows)))
+
+
+  def test_copy(self):
+    a = MultiphaseCollector(self.rows)
+    b = a.copy()
+    b.rowset[0][0] = 'changed'
+    self.assertEqual(a.rowset[0][0], 'a')
+
+
+  def test_copy_on_write(self):
+    a = ColumnStore([['1', 'x'], ['2', 'y']])
+    b = a.copy()
+    self.assertIs(a[0], b[0])
+    b.transform(0, toint)
+    b.transform(1, str)
+    self.assertEqual(a[0], ['1', '2'])
+    self.assertIs(a[1], b[1])
+    a.rows[0][1] = 'z'
+    self.assertEqual(a[1], ['z', 'y'])
+    self.assertEqual(b[1], ['x', 'y'])
+    b.rows[1][0] = None
+    self.assertEqual(b[0], [1, None])
+    self.assertEqual(a[0], ['1', '2'])
+
+
+  def test_transform(self):
+    columns = ColumnStore([['1', '2,5', 'x'], ['-', '3', 'y']])
+    columns.transform(0, toint)
+    columns.transform(1, tofloat)
+    columns.transform(2, str)
+    self.assertIsInstance(columns[0], TypedColumn)
+    self.assertEqual(list(columns[0]), [1, None])
+    self.assertEqual(list(columns[1]), [2.5, 3.0])
+    self.assertEqual(columns[2], ['x', 'y'])
+    self.assertEqual(columns.rows[1], [None, 3.0, 'y'])
+    self.assertEqual(list(columns.copy()[0]), [1, None])
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,60 @@
+import unittest, random, itertools
+from collector import columntype
+from collector.columntype import ColumnTypeItemCollector
+from collector.set import ItemCollectorSet
+from collector.itemcount import ItemCountCollector
+
+
+
+class ColumnTypeTestCase(unittest.TestCase):
+
+  alphabet = '0123456789.,+- x٣²'
+
+
+  def test_cached_decimal_info(self):
+    for length in range(5):
+      for chars in itertools.product('09.,+- x٣', repeat=length):
+        item = ''.join(chars)
+        self.assertEqual(
+          columntype.cached_decimal_info(item), columntype.decimal_info(item),
+          item)
+
+
+  @staticmethod
+  def collect(items, batch, **kwargs):
+    predecessor = ItemCollectorSet((ItemCountCollector(len(items)),))
+    collector = ColumnTypeItemCollector(predecessor, **kwargs)
+    if batch:
+      for start in range(0, len(items), 7):
+        collector.collect_batch(items[start:start+7], predecessor)
+    else:
+      for item in items:
+        collector.collect(item, predecessor)
+    collector.set_collected()
+    return collector.get_result(predecessor), collector.as_str(predecessor)
+
+
+  def test_batch(self):
+    rng = random.Random(0x5eed)
+    for _ in range(2000):
+      column = [
+        ''.join(rng.choice(self.alphabet[:13 if rng.random() < 0.9 else None])
+          for _ in range(rng.randrange(1, 6)))
+        if rng.random() < 0.05 else
+        str(rng.randrange(1000)) if rng.random() < 0.5 else
+        '{:.2f}'.format(rng.random() * 100)
+        for _ in range(rng.randrange(1, 60))]
+      kwargs = {
+        'max_invalid_absolute': rng.randrange(4),
+        'max_invalid_relative': rng.random(),
+        'total_max_invalid': rng.random() * 0.2,
+      }
+      self.assertEqual(
+        self.collect(column, True, **kwargs),
+        self.collect(column, False, **kwargs),
+        column)
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,58 @@
+import unittest, random
+from collector.columnstore import ColumnStore
+from collector.multiphase import MultiphaseCollector
+from collector.rows import RowCollector
+from collector.set import ItemCollectorSet
+from collector.columntype import ColumnTypeItemCollector
+from collector.itemcount import ItemCountCollector
+from collector.letteraverage import ItemLetterAverageCollector
+from collector.minitem import MinItemCollector
+
+
+
+class ConvergenceTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.rows = [
+      ['x' * rng.randrange(3, 6), str(rng.randrange(10))] for _ in range(1000)]
+    self.numbers = [[rng.random()] for _ in range(1000)]
+
+
+  def test_column_type(self):
+    phase = RowCollector(
+      (ItemCollectorSet((ItemCountCollector(1000), ColumnTypeItemCollector))
+        for _ in range(2)),
+      chunk_size=10, tolerance=0.1)
+    phase.collect_all(self.rows)
+    self.assertEqual(phase.consumed_rows, [10, 1000])
+    self.assertIs(phase[0][ColumnTypeItemCollector].get_result(phase[0]), str)
+    self.assertIsNone(phase[0].row_limit)
+
+
+  def test_limit_later_phases(self):
+    collector = MultiphaseCollector(
+      [row[:1] for row in self.rows], chunk_size=50, tolerance=0.05)
+    collector.do_phases((ColumnTypeItemCollector, ItemLetterAverageCollector))
+    consumed = collector.merged_predecessors.consumed_rows[0]
+    self.assertLess(consumed, 1000)
+    column = collector.merged_predecessors[0]
+    self.assertEqual(column.row_limit, consumed)
+    self.assertEqual(column[ItemCountCollector].get_result(), consumed)
+    self.assertAlmostEqual(column[ItemLetterAverageCollector].get_result(column), 4, 0)
+
+    collector.reset()
+    collector.do_phases((ColumnTypeItemCollector, ItemLetterAverageCollector))
+    self.assertEqual(collector.merged_predecessors.consumed_rows[0], consumed)
+
+
+  def test_no_estimate(self):
+    phase = RowCollector(
+      (ItemCollectorSet((MinItemCollector,)),), chunk_size=10, tolerance=1)
+    phase.collect_all(self.numbers)
+    self.assertEqual(phase.consumed_rows, [1000])
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,95 @@
+import unittest, random, math
+import collector.description.normal.L1 as L1
+import collector.description.normal.L2 as L2
+from collector.multiphase import MultiphaseCollector
+from collector.set import ItemCollectorSet
+from collector.normmatrix import norm_matrix
+
+
+
+class NormMatrixTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.phases = []
+    for _ in range(2):
+      rows = [
+        [''.join(rng.choice('abcde') for _ in range(rng.randrange(1, 6))),
+          str(rng.randrange(1000)), '{:.2f}'.format(rng.random() * 10),
+          rng.choice(('x', 'yy', '7'))]
+        for _ in range(rng.randrange(40, 80))]
+      multiphasecollector = MultiphaseCollector(rows)
+      multiphasecollector.do_phases(L1.descriptions)
+      self.phases.append(multiphasecollector.merged_predecessors)
+
+
+  def expected(self, weights):
+    a, b = self.phases
+    return [
+      [ItemCollectorSet.result_norm(a_set.get_result(), b_set.get_result(),
+          weights)
+        for a_set in a]
+      for b_set in b]
+
+
+  def assertNormsEqual(self, actual, expected):
+    self.assertEqual(len(actual), len(expected))
+    for actual_row, expected_row in zip(actual, expected):
+      self.assertEqual(len(actual_row), len(expected_row))
+      for x, y in zip(actual_row, expected_row):
+        if not (math.isnan(x) and math.isnan(y)):
+          self.assertEqual(x, y)
+
+
+  def test_weights(self):
+    for weights in (L1.weights, L2.weights):
+      self.assertNormsEqual(
+        norm_matrix(self.phases[0], self.phases[1], weights),
+        self.expected(weights))
+
+
+  def test_pruned(self):
+    self.phases[1][2].prune()
+    norms = norm_matrix(self.phases[0], self.phases[1], L1.weights)
+    self.assertNormsEqual(norms, self.expected(L1.weights))
+    self.assertEqual(norms[2],
+      [L1.weights[ItemCollectorSet].coefficient] * len(self.phases[0]))
+
+
+  def test_cutoff(self):
+    exact = self.expected(L1.weights)
+    cutoff = 0.3
+    norms = norm_matrix(self.phases[0], self.phases[1], L1.weights, cutoff)
+    for norms_row, exact_row in zip(norms, exact):
+      for norm, exact_norm in zip(norms_row, exact_row):
+        if norm != exact_norm and not math.isnan(exact_norm):
+          self.assertGreater(norm, cutoff)
+          self.assertLessEqual(norm, exact_norm)
+
+
+  def test_result_norm_cutoff(self):
+    a, b = self.phases
+    for a_set in a:
+      for b_set in b:
+        exact_norm = ItemCollectorSet.result_norm(
+          a_set.get_result(), b_set.get_result(), L1.weights)
+        norm = ItemCollectorSet.result_norm(
+          a_set.get_result(), b_set.get_result(), L1.weights, 0.3)
+        if norm != exact_norm and not math.isnan(exact_norm):
+          self.assertGreater(norm, 0.3)
+          self.assertLessEqual(norm, exact_norm)
+
+
+  def test_max_norm_cost(self):
+    exact = self.expected(L1.weights)
+    norms = norm_matrix(self.phases[0], self.phases[1], L1.weights,
+      max_norm_cost=1)
+    for norms_row, exact_row in zip(norms, exact):
+      for norm, exact_norm in zip(norms_row, exact_row):
+        if not math.isnan(exact_norm):
+          self.assertLessEqual(norm, exact_norm)
+
+
+
+if __name__ == '__main__':
+  unittest.main()
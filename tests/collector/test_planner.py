@@ -0,0 +1,104 @@
+import unittest, random
+from collector.base import ItemCollector
+from collector.set import ItemCollectorSet
+from collector.multiphase import MultiphaseCollector
+from collector.planner import plan_column, merge_descriptions, PhasePlan
+from collector import columntype
+from collector.itemaverage import ItemAverageCollector
+from collector.letteraverage import ItemLetterAverageCollector
+from collector.variance import ItemVariationCoefficientCollector
+from collector.lettervariance import LetterVariationCoefficient
+
+
+
+class A(ItemCollector): pass
+
+class B(ItemCollector):
+  pre_dependencies = (A,)
+
+class C(ItemCollector):
+  result_dependencies = (B,)
+
+class D(ItemCollector):
+  collect_cost = 3
+  def collect(self, item, collector_set=None): pass
+
+class E(ItemCollector):
+  pre_dependencies = (D,)
+  def collect(self, item, collector_set=None): pass
+
+
+
+class PhasePlannerTestCase(unittest.TestCase):
+
+  def test_earliest_phases(self):
+    phases = plan_column((C, D, E), ItemCollectorSet())
+    self.assertEqual(list(map(list, phases)), [[A, D], [C, E]])
+
+
+  def test_collected_predecessors(self):
+    predecessors = ItemCollectorSet((A, D))
+    predecessors.set_collected()
+    phases = plan_column((C, D, E), predecessors)
+    self.assertEqual(list(map(list, phases)), [[C, E]])
+
+
+  def test_estimate_costs(self):
+    plan = PhasePlan.from_columns((
+      plan_column((C, D, E), ItemCollectorSet()),
+      plan_column((D,), ItemCollectorSet())))
+    self.assertEqual(len(plan), 2)
+    self.assertEqual(plan.estimate_costs(10), [10 * (0 + 3 + 3), 10 * 1])
+
+
+
+
+class MergedDescriptionsTestCase(unittest.TestCase):
+
+  averages = (
+    columntype.ColumnTypeItemCollector,
+    columntype.factory(ItemLetterAverageCollector, ItemAverageCollector))
+
+  variations = (
+    columntype.ColumnTypeItemCollector,
+    columntype.factory(
+      LetterVariationCoefficient, ItemVariationCoefficientCollector))
+
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.rows = [
+      [''.join(rng.choice('abcde') for _ in range(rng.randrange(1, 5))),
+        str(rng.randrange(100))]
+      for _ in range(50)]
+
+
+  def collect(self, collectorset_description):
+    multiphasecollector = MultiphaseCollector(self.rows)
+    multiphasecollector.do_phases(collectorset_description)
+    return multiphasecollector
+
+
+  def test_merge(self):
+    union = merge_descriptions((self.averages, self.variations))
+    self.assertEqual(union, self.averages + self.variations[1:])
+
+
+  def test_view(self):
+    union = self.collect(merge_descriptions((self.averages, self.variations)))
+    for desc in (self.averages, self.variations):
+      expected = self.collect(desc).merged_predecessors
+      view = union.view(desc).merged_predecessors
+      for expected_set, view_set in zip(expected, view):
+        self.assertEqual(format(view_set, '.9e'), format(expected_set, '.9e'))
+        independent = [ctype
+          for ctype, collector in expected_set.items()
+          if not collector.isdependency]
+        self.assertEqual(independent, [ctype
+          for ctype, collector in view_set.items()
+          if not collector.isdependency])
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,100 @@
+import unittest, random
+import collector.description.normal.L1 as description
+from collector.columnstore import ColumnStore
+from collector.multiphase import MultiphaseCollector
+from collector.set import ItemCollectorSet
+from collector.columntype import ColumnTypeItemCollector
+from collector.itemcount import ItemCountCollector
+from collector.itemfrequency import ItemFrequencyCollector
+
+
+
+class ResumeTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.rows = [
+      [''.join(rng.choice('abcde') for _ in range(rng.randrange(1, 5))),
+        str(rng.randrange(100)), '{:.2f}'.format(rng.random() * 10)]
+      for _ in range(100)]
+
+
+  @staticmethod
+  def collect(rows):
+    multiphasecollector = MultiphaseCollector(rows)
+    multiphasecollector.do_phases(description.descriptions)
+    return multiphasecollector
+
+
+  @staticmethod
+  def results(multiphasecollector):
+    return [format(s, '.9e') for s in multiphasecollector.merged_predecessors]
+
+
+  def resume(self, head_count):
+    multiphasecollector = self.collect(self.rows[:head_count])
+    appended = ColumnStore(self.rows[head_count:])
+    return multiphasecollector.merged_predecessors.resume_columns(
+      appended, len(self.rows)), multiphasecollector
+
+
+  def test_resume(self):
+    resumed, multiphasecollector = self.resume(60)
+    self.assertTrue(resumed)
+    self.assertEqual(
+      self.results(multiphasecollector), self.results(self.collect(self.rows)))
+    self.assertEqual(
+      multiphasecollector.merged_predecessors[1][ItemCountCollector]
+        .get_result(), len(self.rows))
+
+
+  def test_many_values(self):
+    rng = random.Random(0x5eed)
+    self.rows = [
+      [str(rng.randrange(-5000, 5000)), '{:.3f}'.format(rng.gauss(10, 3))]
+      for _ in range(3000)]
+    resumed, multiphasecollector = self.resume(1500)
+    self.assertTrue(resumed)
+    collected = self.collect(self.rows)
+    self.assertEqual(self.results(multiphasecollector), self.results(collected))
+    for resumed_set, collected_set in zip(
+      multiphasecollector.merged_predecessors, collected.merged_predecessors
+    ):
+      buckets = collected_set[ItemFrequencyCollector].frequencies.buckets()
+      self.assertGreater(len(buckets), 256)
+      self.assertEqual(
+        resumed_set[ItemFrequencyCollector].frequencies.buckets(), buckets)
+      self.assertEqual(
+        list(resumed_set[ItemFrequencyCollector].get_result(resumed_set)),
+        list(collected_set[ItemFrequencyCollector].get_result(collected_set)))
+
+
+  def test_type_change(self):
+    self.rows[80][1] = 'x'
+    self.assertFalse(self.resume(60)[0])
+
+
+  def test_int_to_float(self):
+    self.rows[80][1] = '1.5'
+    self.assertFalse(self.resume(60)[0])
+
+
+  def test_single_pass(self):
+    collectors = ItemCollectorSet((
+      ItemCountCollector(3), ColumnTypeItemCollector))
+    collectors.collect_batch(['a', 'b', 'c'])
+    collectors.set_collected()
+    frequencies = ItemCollectorSet(
+      (ItemFrequencyCollector,), collectors)
+    frequencies.collect_batch(['a', 'b', 'c'])
+    frequencies.set_collected()
+    self.assertTrue(frequencies.resume_column(['a', 'd'], 5))
+    self.assertEqual(frequencies[ItemCountCollector].get_result(), 5)
+    self.assertEqual(
+      dict(frequencies[ItemFrequencyCollector].get_result()),
+      {'a': 2, 'b': 1, 'c': 1, 'd': 1})
+
+
+
+if __name__ == '__main__':
+  unittest.main()
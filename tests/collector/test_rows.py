@@ -0,0 +1,94 @@
+import unittest, random
+from collector.base import ItemCollector
+from collector.columnstore import ColumnStore
+from collector.rows import RowCollector
+from collector.set import ItemCollectorSet
+from collector.itemcount import ItemCountCollector
+from collector.itemsum import ItemSumCollector
+from collector.letterfrequency import LetterFrequencyCollector
+from collector.lettercount import ItemLetterCountCollector
+from collector.itemfrequency import ItemFrequencyCollector
+from collector.itemprobability import ItemProbabilityCollector
+from collector.multiphase import MultiphaseCollector
+import collector.description.normal.L1 as L1
+
+
+
+class ItemListCollector(ItemCollector):
+  """Implements only the item-wise collection protocol"""
+
+  def __init__(self, previous_collector_set=None):
+    super().__init__(previous_collector_set)
+    self.items = []
+
+
+  def collect(self, item, collector_set=None):
+    self.items.append(item)
+
+
+  def get_result(self, collector_set=None):
+    return self.items
+
+
+
+class BatchCollectionTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.rows = [
+      [''.join(rng.choice('abcde') for _ in range(rng.randrange(5))),
+        rng.randrange(100)]
+      for _ in range(100)]
+
+
+  def collect(self, chunk_size, row_wise=False):
+    phase = RowCollector(
+      (ItemCollectorSet((ItemListCollector, ItemCountCollector) + c)
+        for c in ((LetterFrequencyCollector, ItemLetterCountCollector),
+          (ItemSumCollector,))),
+      chunk_size=chunk_size)
+    if row_wise:
+      phase.collect_all(self.rows)
+    else:
+      phase.collect_columns(ColumnStore(self.rows))
+    return [
+      [(dict(r) if isinstance(r, dict) else r)
+        for r in (collector.get_result(s) for collector in s.values())]
+      for s in phase]
+
+
+  def test_chunk_sizes(self):
+    expected = self.collect(None)
+    self.assertEqual(expected[0][0], [row[0] for row in self.rows])
+    self.assertEqual(expected[1][-1], sum(row[1] for row in self.rows))
+    for chunk_size in (1, 7, 100, 1000):
+      self.assertEqual(self.collect(chunk_size), expected)
+      self.assertEqual(self.collect(chunk_size, True), expected)
+
+
+  def test_numeric_frequencies(self):
+    rng = random.Random(0x5eed)
+    rows = [
+      ['{:.2f}'.format(rng.gauss(100, 20)), str(rng.randrange(-5000, 5000))]
+      for _ in range(3000)]
+    def collect(chunk_size):
+      multiphasecollector = MultiphaseCollector(
+        [list(row) for row in rows], None, 0, chunk_size)
+      multiphasecollector.do_phases(L1.descriptions)
+      result = []
+      for collector_set in multiphasecollector.merged_predecessors:
+        frequencies = collector_set[ItemFrequencyCollector].frequencies
+        self.assertGreater(len(frequencies.buckets()), 256)
+        probabilities = collector_set[ItemProbabilityCollector]
+        result.append((frequencies.buckets(),
+          list(probabilities.get_result(collector_set))))
+      return result
+
+    expected = collect(None)
+    for chunk_size in (1, 7):
+      self.assertEqual(collect(chunk_size), expected)
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,132 @@
+import unittest, random, itertools
+from math import fsum
+from operator import itemgetter
+from utilities import infinity
+from utilities.assignment import solve, branch_and_bound, ranked, SearchStatistics
+from utilities.timelimit import Timelimit
+
+
+
+def all_assignments(distance_matrix):
+  for rows in itertools.permutations(range(len(distance_matrix)), len(distance_matrix[0])):
+    distances = [distance_matrix[i][j] for j, i in enumerate(rows)]
+    if None not in distances:
+      yield fsum(distances), rows
+
+
+def brute_force(distance_matrix):
+  return min(all_assignments(distance_matrix), default=(infinity, None))
+
+
+
+class AssignmentSolverTestCase(unittest.TestCase):
+
+  solver = staticmethod(solve)
+
+
+  def setUp(self):
+    self.random = random.Random(0x5eed)
+
+
+  def __random_matrix(self, row_count, column_count, forbidden=0.0):
+    return [
+      [None if self.random.random() < forbidden else self.random.random()
+        for _ in range(column_count)]
+      for _ in range(row_count)]
+
+
+  def __do_test(self, distance_matrix):
+    expected_norm, _ = brute_force(distance_matrix)
+    statistics = SearchStatistics()
+    norm, mapping = self.solver(distance_matrix, statistics)
+    self.assertAlmostEqual(norm, expected_norm)
+    self.assertAlmostEqual(statistics.gap, 0)
+    if mapping is not None:
+      self.assertEqual(len(set(mapping)), len(mapping))
+      self.assertAlmostEqual(
+        fsum(distance_matrix[i][j] for j, i in enumerate(mapping)), norm)
+
+
+  def test_square(self):
+    for n in range(1, 7):
+      self.__do_test(self.__random_matrix(n, n))
+
+
+  def test_rectangular(self):
+    for m, n in ((2, 1), (5, 3), (7, 4), (6, 2)):
+      self.__do_test(self.__random_matrix(m, n))
+
+
+  def test_forbidden(self):
+    for _ in range(20):
+      self.__do_test(self.__random_matrix(6, 4, 0.4))
+
+
+  def test_infeasible(self):
+    distance_matrix = [[0.5, None], [0.2, None], [None, None]]
+    self.assertEqual(self.solver(distance_matrix), (infinity, None))
+
+
+  def test_ties(self):
+    distance_matrix = [[1.0, 1.0, 1.0]] * 4
+    norm, mapping = self.solver(distance_matrix)
+    self.assertEqual(norm, 3.0)
+    self.assertEqual(len(set(mapping)), 3)
+
+
+  def test_empty(self):
+    self.assertEqual(self.solver([]), (0, ()))
+
+
+
+class BranchAndBoundTestCase(AssignmentSolverTestCase):
+
+  solver = staticmethod(branch_and_bound)
+
+
+  def test_pruning(self):
+    distance_matrix = [[float(i != j) for j in range(6)] for i in range(8)]
+    statistics = SearchStatistics()
+    self.assertEqual(branch_and_bound(distance_matrix, statistics),
+      (0.0, tuple(range(6))))
+    self.assertGreater(statistics.pruned, 0)
+
+
+  def test_interrupted(self):
+    distance_matrix = [[0.5, 0.25], [0.75, 1.0]]
+    statistics = SearchStatistics()
+    Timelimit.interrupted_flag = True
+    try:
+      self.assertEqual(branch_and_bound(distance_matrix, statistics),
+        (infinity, None))
+    finally:
+      Timelimit.interrupted_flag = None
+    self.assertTrue(statistics.interrupted)
+    self.assertEqual(statistics.lower_bound, 1.0)
+
+
+
+
+class RankedAssignmentTestCase(unittest.TestCase):
+
+  def test_ranking(self):
+    rng = random.Random(0x5eed)
+    for m, n, forbidden in ((3, 3, 0), (5, 3, 0), (4, 4, 0.3)):
+      distance_matrix = [
+        [None if rng.random() < forbidden else rng.random() for _ in range(n)]
+        for _ in range(m)]
+      expected = sorted(all_assignments(distance_matrix))
+      found = list(ranked(distance_matrix))
+      self.assertEqual(len(found), len(expected))
+      self.assertEqual(len(set(map(itemgetter(1), found))), len(found))
+      for (expected_norm, _), (norm, _) in zip(expected, found):
+        self.assertAlmostEqual(norm, expected_norm)
+
+
+  def test_infeasible(self):
+    self.assertEqual(list(ranked([[None], [None]])), [])
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -1,5 +1,9 @@
-import unittest, copy
-from utilities.distribution import UniformBinDistributionTable
+import unittest, copy, random, pickle
+from math import fsum
+from collections import Counter
+from utilities.distribution import UniformBinDistributionTable, \
+  StreamingHistogram, LetterDistributionTable, SparseDistributionTable, \
+  Vocabulary
 
 
 
@@ -97,5 +101,181 @@ class UniformBinDistributionTableDistanceTestCase(unittest.TestCase):
 
 
 
+
+class StreamingHistogramTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.data = [round(rng.gauss(100, 15), 2) for _ in range(2000)]
+    self.rng = rng
+
+
+  def __histogram(self, data, max_bins=None, chunk_size=None):
+    histogram = \
+      StreamingHistogram() if max_bins is None else StreamingHistogram(max_bins)
+    if chunk_size is None:
+      for item in data:
+        histogram.increase(item)
+    else:
+      for start in range(0, len(data), chunk_size):
+        histogram.increase_all(data[start:start+chunk_size])
+    return histogram
+
+
+  def test_exact(self):
+    data = self.data
+    histogram = self.__histogram(data)
+    self.assertGreater(len(set(data)), 256)
+    self.assertIsNone(histogram.precision)
+    self.assertEqual(histogram.buckets(),
+      [(x, x, data.count(x)) for x in sorted(set(data))])
+
+    table = histogram.as_uniform_table()
+    mean = fsum(data) / len(data)
+    expected = UniformBinDistributionTable.for_variance(
+      len(data), min(data), max(data),
+      fsum((x - mean) ** 2 for x in data) / len(data), 'I')
+    for item in data:
+      expected.increase(item)
+    self.assertEqual(list(table), list(expected))
+
+
+  def test_bounded(self):
+    histogram = self.__histogram(self.data, 32)
+    buckets = histogram.buckets()
+    self.assertLessEqual(len(buckets), 32)
+    self.assertIsNotNone(histogram.precision)
+    self.assertEqual(sum(count for _, _, count in buckets), len(self.data))
+    self.assertEqual((histogram.min, histogram.max), (min(self.data), max(self.data)))
+    mean = fsum(self.data) / len(self.data)
+    self.assertAlmostEqual(histogram.moments.mean, mean, delta=1)
+    table = histogram.as_uniform_table()
+    self.assertAlmostEqual(fsum(table), len(self.data))
+    exact = self.__histogram(self.data)
+    self.assertLess(
+      (histogram / len(self.data)).distance_to(exact / len(self.data)), 0.05)
+
+
+  def test_order_independent(self):
+    for max_bins in (None, 32):
+      expected = self.__histogram(self.data, max_bins)
+      for chunk_size in (1, 7, 256, None):
+        data = list(self.data)
+        self.rng.shuffle(data)
+        histogram = self.__histogram(data, max_bins, chunk_size)
+        self.assertEqual(histogram.precision, expected.precision)
+        self.assertEqual(histogram.buckets(), expected.buckets())
+        self.assertEqual(list(histogram.as_uniform_table()),
+          list(expected.as_uniform_table()))
+
+
+  def test_merge(self):
+    for max_bins in (None, 32):
+      whole = self.__histogram(self.data, max_bins)
+      merged = self.__histogram(self.data[:700], max_bins).merge(
+        self.__histogram(self.data[700:], max_bins))
+      self.assertEqual(merged.count(), whole.count())
+      self.assertEqual(merged.buckets(), whole.buckets())
+      self.assertEqual(list(merged.as_uniform_table()),
+        list(whole.as_uniform_table()))
+
+
+  def test_pickle(self):
+    histogram = self.__histogram(self.data, 32)
+    copied = pickle.loads(pickle.dumps(histogram))
+    self.assertEqual(copied.buckets(), histogram.buckets())
+    copied.increase(1000.5)
+    self.assertEqual(copied.count(), histogram.count() + 1)
+
+
+
+
+class LetterDistributionTableTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.items = [
+      [''.join(rng.choice(alphabet) for _ in range(rng.randrange(8)))
+        for _ in range(50)]
+      for alphabet in ('abcde ', 'abcxyz\xe4', 'ab\u03b1\u03b2\u20ac')]
+
+
+  @staticmethod
+  def __table(items, bulk=True):
+    table = LetterDistributionTable()
+    if bulk:
+      table.increase_all(items)
+    else:
+      for item in items:
+        for char in item:
+          table.increase(char)
+    return table
+
+
+  def test_counts(self):
+    for items in self.items:
+      expected = Counter(''.join(items))
+      for bulk in (True, False):
+        table = self.__table(items, bulk)
+        self.assertEqual(dict(table), expected)
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(table.count(), sum(expected.values()))
+        self.assertEqual(sorted(table.values()), sorted(expected.values()))
+
+
+  def test_distance(self):
+    for a in self.items:
+      for b in self.items:
+        a_dist = self.__table(a).normalize()
+        b_dist = self.__table(b).normalize()
+        self.assertEqual(a_dist.distance_to(b_dist), fsum(
+          abs(a_dist.get(k, 0) - b_dist.get(k, 0))
+          for k in a_dist.keys() | b_dist.keys()))
+
+
+
+
+class SparseDistributionTableTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.tables = []
+    for _ in range(4):
+      table = SparseDistributionTable(int)
+      for _ in range(200):
+        table['item{}'.format(rng.randrange(rng.randrange(1, 80)))] += 1
+      self.tables.append(table.normalize())
+
+
+  def test_indexed_distance(self):
+    expected = [[a.distance_to(b) for b in self.tables] for a in self.tables]
+    vocabulary = Vocabulary()
+    for table in self.tables:
+      table.index(vocabulary)
+    self.assertEqual(len(vocabulary),
+      len(set().union(*map(dict.keys, self.tables))))
+    self.assertEqual(
+      [[a.distance_to(b) for b in self.tables] for a in self.tables], expected)
+
+    copies = pickle.loads(pickle.dumps(self.tables))
+    self.assertEqual(
+      [[a.distance_to(b) for b in copies] for a in copies], expected)
+
+
+  def test_distance_keeps_other(self):
+    a = SparseDistributionTable(int, {'x': 2, 'y': 1})
+    b = SparseDistributionTable(int, {'y': 3, 'z': 1})
+    self.assertEqual(a.distance_to(b), 5)
+    self.assertEqual(b.distance_to(a), 5)
+    self.assertEqual(dict(a), {'x': 2, 'y': 1})
+    self.assertEqual(dict(b), {'y': 3, 'z': 1})
+    for table in self.tables:
+      snapshot = dict(table)
+      for other in self.tables:
+        other.distance_to(table)
+      self.assertEqual(dict(table), snapshot)
+
+
+
 if __name__ == '__main__':
   unittest.main()
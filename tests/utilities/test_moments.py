@@ -0,0 +1,54 @@
+import unittest, random
+from math import fsum, sqrt
+from utilities.moments import Moments, HigherMoments
+
+
+
+def central_moment(data, k):
+  mean = fsum(data) / len(data)
+  return fsum((x - mean) ** k for x in data) / len(data)
+
+
+
+class MomentsTestCase(unittest.TestCase):
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.data = [rng.lognormvariate(10, 1) for _ in range(1000)]
+
+
+  def test_two_pass_equivalence(self):
+    moments = HigherMoments().update(self.data)
+    variance = central_moment(self.data, 2)
+    self.assertEqual(moments.count, len(self.data))
+    self.assertAlmostEqual(moments.mean / (fsum(self.data) / len(self.data)), 1)
+    self.assertAlmostEqual(moments.variance / variance, 1)
+    self.assertAlmostEqual(moments.skewness,
+      central_moment(self.data, 3) / variance ** 1.5)
+    self.assertAlmostEqual(moments.kurtosis,
+      central_moment(self.data, 4) / (variance * variance) - 3)
+    self.assertAlmostEqual(moments.variation_coefficient,
+      sqrt(variance) / moments.mean)
+
+
+  def test_merge(self):
+    for moments_type in (Moments, HigherMoments):
+      whole = moments_type().update(self.data)
+      merged = moments_type()
+      for start, end in ((0, 300), (300, 301), (301, 301), (301, 1000)):
+        merged += moments_type().update(self.data[start:end])
+      self.assertEqual(merged.count, whole.count)
+      for attr in ('mean', 'variance', 'skewness', 'kurtosis'):
+        if hasattr(whole, attr):
+          self.assertAlmostEqual(getattr(merged, attr) / getattr(whole, attr), 1)
+
+
+  def test_empty(self):
+    moments = HigherMoments()
+    self.assertNotEqual(moments.variance, moments.variance)
+    self.assertEqual(moments.merge(Moments()).count, 0)
+
+
+
+if __name__ == '__main__':
+  unittest.main()
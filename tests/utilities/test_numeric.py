@@ -0,0 +1,140 @@
+import unittest, random
+from utilities import numeric
+from utilities.moments import HigherMoments
+from utilities.distribution import UniformBinDistributionTable, \
+  StreamingHistogram
+import collector.description.normal.L1 as L1
+from collector.multiphase import MultiphaseCollector
+from collector.itemfrequency import ItemFrequencyCollector
+
+
+
+@unittest.skipIf(numeric.numpy is None, 'NumPy is not available')
+class NumericBackendTestCase(unittest.TestCase):
+  """Compares the results of the NumPy backend to those of pure Python"""
+
+  def setUp(self):
+    rng = random.Random(0x5eed)
+    self.items = [rng.gauss(100, 20) for _ in range(1000)]
+    self.items[10:20] = (None, float('nan')) * 5
+    self.numpy = numeric.numpy
+
+
+  def tearDown(self):
+    numeric.numpy = self.numpy
+
+
+  def both_backends(self, function):
+    result = function()
+    numeric.numpy = None
+    try:
+      return result, function()
+    finally:
+      numeric.numpy = self.numpy
+
+
+  def test_items(self):
+    def aggregate():
+      values, invalid_count = numeric.numeric_items(self.items)
+      moments = numeric.add_moments(HigherMoments(), values)
+      return (invalid_count, numeric.total(values), numeric.minimum(values, None),
+        numeric.maximum(values, None), moments.count, moments.mean,
+        moments.variance, moments.skewness, moments.kurtosis)
+
+    a, b = self.both_backends(aggregate)
+    self.assertEqual(a[:1], b[:1])
+    for x, y in zip(a[1:], b[1:]):
+      self.assertAlmostEqual(x, y)
+
+
+  def test_distribution(self):
+    values = [item for item in self.items if item is not None and item == item]
+    def distance():
+      a = UniformBinDistributionTable(0, 200, 13)
+      b = UniformBinDistributionTable(40, 190, 20)
+      a.increase_all(values, [1] * len(values))
+      b.increase_all(values[::2], [1] * len(values[::2]))
+      return tuple(a.data), tuple(b.data), a.distance_to(b)
+
+    a, b = self.both_backends(distance)
+    self.assertEqual(a[:2], b[:2])
+    self.assertAlmostEqual(a[2], b[2])
+
+
+  def test_item_frequencies(self):
+    rng = random.Random(0x5eed)
+    rows = [['{:.2f}'.format(rng.gauss(100, 20)), str(rng.randrange(-5000, 5000))]
+      for _ in range(3000)]
+    def frequencies():
+      multiphasecollector = MultiphaseCollector([list(row) for row in rows])
+      multiphasecollector.do_phases(L1.descriptions)
+      result = []
+      for collector_set in multiphasecollector.merged_predecessors:
+        collector = collector_set[ItemFrequencyCollector]
+        self.assertGreater(len(collector.frequencies.buckets()), 256)
+        result.append((collector.frequencies.buckets(),
+          list(collector.get_result(collector_set))))
+      return result
+
+    a, b = self.both_backends(frequencies)
+    self.assertEqual(a, b)
+
+
+  def test_bounded_histogram(self):
+    values = [round(item, 2)
+      for item in self.items if item is not None and item == item]
+    def buckets():
+      histogram = StreamingHistogram(32)
+      histogram.increase_all(numeric.numeric_items(values)[0])
+      return histogram.buckets(), list(histogram.as_uniform_table())
+
+    a, b = self.both_backends(buckets)
+    self.assertEqual(a, b)
+
+
+
+
+class TypedColumnTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.numpy = numeric.numpy
+
+
+  def tearDown(self):
+    numeric.numpy = self.numpy
+
+
+  def test_items(self):
+    items = [3, None, -7, 12, None]
+    column = numeric.TypedColumn.from_items('q', items)
+    self.assertEqual(list(column), items)
+    self.assertEqual(list(column[1:4]), items[1:4])
+    self.assertEqual(column.count(None), 2)
+    self.assertEqual(len(column.copy()), len(items))
+    for numpy in (self.numpy, None):
+      numeric.numpy = numpy
+      values, invalid_count = numeric.numeric_items(column)
+      self.assertEqual(list(values), [3, -7, 12])
+      self.assertEqual(invalid_count, 2)
+
+
+  def test_float(self):
+    items = [1.5, float('nan'), None, 2.0]
+    column = numeric.TypedColumn.from_items('d', items)
+    self.assertIsNotNone(column.mask)
+    for numpy in (self.numpy, None):
+      numeric.numpy = numpy
+      values, invalid_count = numeric.numeric_items(column)
+      self.assertEqual(list(values), [1.5, 2.0])
+      self.assertEqual(invalid_count, 1)
+      self.assertEqual(
+        numeric.total(values), numeric.total(numeric.numeric_items(items)[0]))
+
+
+  def test_overflow(self):
+    self.assertIsNone(numeric.TypedColumn.from_items('q', [1, 1 << 70]))
+
+
+
+if __name__ == '__main__':
+  unittest.main()
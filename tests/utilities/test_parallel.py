@@ -0,0 +1,31 @@
+import unittest, os
+from utilities import parallel
+
+
+
+def identify(offset, item):
+  return os.getpid(), item + offset
+
+
+
+class ParallelMapTestCase(unittest.TestCase):
+
+  def test_order(self):
+    items = list(range(20))
+    for jobs in (1, 2, 0):
+      self.assertEqual(
+        [result for _, result in parallel.map(identify, items, jobs, 100)],
+        [item + 100 for item in items])
+
+
+  def test_serial(self):
+    self.assertEqual(
+      {pid for pid, _ in parallel.map(identify, range(5), 1, 0)},
+      {os.getpid()})
+    self.assertNotIn(os.getpid(),
+      {pid for pid, _ in parallel.map(identify, range(5), 2, 0)})
+
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,38 @@
+import unittest, io
+from utilities.sampling import sample_lines
+
+
+
+class SampleLinesTestCase(unittest.TestCase):
+
+  def setUp(self):
+    self.lines = [
+      '{};{}\n'.format(i, 'x' * (i % 17)).encode() for i in range(2000)]
+    self.data = b''.join(self.lines)
+
+
+  def sample(self, *args, **kwargs):
+    return list(sample_lines(io.BytesIO(self.data), *args, **kwargs))
+
+
+  def test_whole_lines(self):
+    sample = self.sample(20, 256, seed=1)
+    self.assertEqual(sample[0], self.lines[0])
+    self.assertLess(len(sample), len(self.lines) / 4)
+    indices = [self.lines.index(line) for line in sample]
+    self.assertEqual(indices, sorted(set(indices)))
+
+
+  def test_deterministic(self):
+    self.assertEqual(self.sample(20, 256, seed=1), self.sample(20, 256, seed=1))
+    self.assertNotEqual(self.sample(20, 256, seed=1), self.sample(20, 256, seed=2))
+
+
+  def test_small_files(self):
+    self.assertEqual(self.sample(3, len(self.data)), self.lines)
+    self.assertEqual(self.sample(len(self.data), 1), self.lines)
+
+
+
+if __name__ == '__main__':
+  unittest.main()